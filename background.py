@@ -6,20 +6,48 @@ import threading
 import time
 import traceback
 
+try:
+    import fcntl
+except ImportError:  # not POSIX (Windows) — single dev-server process
+    fcntl = None
+
+# Imported up front so missing dependencies fail at boot and the heavy
+# pandas/LightGBM imports happen before the first refresh, not during it.
+import collector
+import predict
+from config import BASE_DIR
+
+# Every gunicorn worker starts the thread (gunicorn.conf.py post_worker_init), and
+# each one blocks on this lock; only the holder refreshes.  The kernel drops
+# the lock when that worker exits, so a respawned or sibling worker takes over.
+REFRESH_LOCK = BASE_DIR / ".refresh.lock"
+
+
+_lockfile = None  # kept open (and locked) for the life of the process
+
+
+def _hold_refresh_lock() -> None:
+    """Block until this process is the one that runs refreshes."""
+    global _lockfile
+    if fcntl is None:
+        return
+    _lockfile = open(REFRESH_LOCK, "w")
+    fcntl.flock(_lockfile, fcntl.LOCK_EX)
+
 
 def _refresh_loop():
     """Run collector + predict every 6 hours."""
+    _hold_refresh_lock()
+
     # Wait for initial startup to finish
     time.sleep(60)
 
     while True:
         try:
             print("\n[background] Refreshing data...")
-            import collector
             collector.main()  # fetch new forecast + recent observations
 
             print("[background] Regenerating predictions...")
-            import predict
             predict.main()
 
             print("[background] Refresh complete.")
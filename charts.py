@@ -1,10 +1,17 @@
 """
-Generate forecast charts as base64-encoded PNGs.
-Uses matplotlib + seaborn with a dark theme matching the dashboard.
+Generate forecast charts as image files (dashboard) or in-memory PNGs.
+Uses matplotlib with a dark theme matching the dashboard.
 """
 import io
+import os
 import base64
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
@@ -13,8 +20,18 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import matplotlib.ticker as mticker
-from matplotlib.collections import PolyCollection
-import seaborn as sns
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+
+from config import CHART_DIR
+
+try:
+    # SIMD base64 codec (AVX2/SSSE3); same output as the stdlib encoder
+    from pybase64 import b64encode_as_string as _b64encode
+except ImportError:
+    def _b64encode(data: bytes) -> str:
+        return base64.b64encode(data).decode("utf-8")
 
 
 # ── Colors ─────────────────────────────────────────────
@@ -41,6 +58,19 @@ COLORS = {
 }
 
 
+# 96 dpi renders the 14" figures ~1150 px wide after the tight bbox — close
+# to the dashboard's 1400 px max width.  Dashboard files are lossless WebP
+# (~3× smaller than PNG, no text artifacts); /chart/<name> keeps serving PNG,
+# encoded at zlib level 1 since Deflate dominates savefig time and those are
+# rendered per request.
+CHART_DPI = 96
+CHART_FORMAT = "webp"
+_SAVE_KWARGS = {
+    "png": {"pil_kwargs": {"compress_level": 1}},
+    "webp": {"pil_kwargs": {"lossless": True}},
+}
+
+
 def _apply_dark_theme():
     """Set matplotlib rcParams with fully white text."""
     plt.rcParams.update({
@@ -67,189 +97,337 @@ def _apply_dark_theme():
     })
 
 
-def _fig_to_base64(fig, dpi=130) -> str:
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight",
-                facecolor=fig.get_facecolor(), edgecolor="none")
-    plt.close(fig)
+_apply_dark_theme()
+
+
+# ── Figure cache ───────────────────────────────────────
+# Each chart keeps its Figure/Axes (and PNG buffer) alive between renders;
+# only the artists are cleared.  Figures are built directly rather than via
+# pyplot so they stay out of pyplot's global figure registry.
+_FIG_CACHE: dict[str, tuple] = {}
+_FIG_CACHE_LOCK = threading.Lock()
+_BUFFERS: dict = {}
+_TWINS: dict = {}
+
+
+@contextmanager
+def _cached_figure(key: str, nrows: int = 1, ncols: int = 1, *,
+                   figsize: tuple[float, float], **subplot_kw):
+    """Yield a cleared ``(fig, axes)`` pair for ``key``, building it on first use."""
+    with _FIG_CACHE_LOCK:
+        if key not in _FIG_CACHE:
+            fig = Figure(figsize=figsize)
+            axes = fig.subplots(nrows, ncols, **subplot_kw)
+            _BUFFERS[fig] = io.BytesIO()
+            _FIG_CACHE[key] = (fig, axes, threading.Lock())
+        fig, axes, lock = _FIG_CACHE[key]
+
+    with lock:
+        for ax in fig.axes:
+            ax.cla()
+            # cla() keeps the old data bounds; without this a call that only
+            # updates one axis (axhspan) inherits the previous render's x-range
+            ax.dataLim.set_points(Bbox.null().get_points())
+            ax.ignore_existing_data_limits = True
+        yield fig, axes
+
+
+def _twinx(ax):
+    """Cached ``ax.twinx()``; ``cla()`` resets the twin's right-hand axis setup."""
+    twin = _TWINS.get(ax)
+    if twin is None:
+        twin = _TWINS[ax] = ax.twinx()
+        return twin
+    twin.yaxis.tick_right()
+    twin.yaxis.set_label_position("right")
+    twin.yaxis.set_offset_position("right")
+    ax.yaxis.tick_left()
+    twin.xaxis.set_visible(False)
+    twin.patch.set_visible(False)
+    return twin
+
+
+def _fig_to_png(fig, dpi=CHART_DPI) -> bytes:
+    buf = _BUFFERS.get(fig) or io.BytesIO()
     buf.seek(0)
-    return base64.b64encode(buf.read()).decode("utf-8")
+    buf.truncate(0)
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight",
+                facecolor=fig.get_facecolor(), edgecolor="none", **_SAVE_KWARGS["png"])
+    return buf.getvalue()
+
+
+def _fig_to_file(fig, path: Path, dpi=CHART_DPI) -> Path:
+    """Save ``fig`` to ``path`` (format from the suffix), atomically replacing any old file."""
+    fmt = path.suffix.lstrip(".")
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}-", suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            fig.savefig(f, format=fmt, dpi=dpi, bbox_inches="tight",
+                        facecolor=fig.get_facecolor(), edgecolor="none",
+                        **_SAVE_KWARGS.get(fmt, {}))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def _export(fig, path: Path | None) -> bytes | Path:
+    """Write ``fig`` to ``path`` if given, otherwise return the PNG bytes."""
+    if path is None:
+        return _fig_to_png(fig)
+    return _fig_to_file(fig, path)
+
+
+RANGE_COLS = ("temperature_range_c", "precip_range_mm")
+
+# Forecast hours as stored in latest_forecast.json (one dict per hour), or
+# column-major like Open-Meteo's ``hourly`` block ({"time": [...], ...}).
+# pandas builds a frame from columns without walking every row dict.
+Hourly = list[dict] | dict[str, list]
 
 
-def _build_df(hourly: list[dict]) -> pd.DataFrame:
+def _build_df(hourly: Hourly) -> pd.DataFrame:
+    """Hourly forecast rows or columns → time-indexed numeric frame.
+
+    ``[lo, hi]`` range columns are split once into ``<col>_lo`` / ``<col>_hi``
+    float columns so the charts don't re-walk the lists on every render.
+    """
     df = pd.DataFrame(hourly)
     df["time"] = pd.to_datetime(df["time"])
     df.set_index("time", inplace=True)
-    for col in df.columns:
-        if col not in ("temperature_range_c", "precip_range_mm"):
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    num_cols = df.columns.difference(RANGE_COLS)
+    df[num_cols] = df[num_cols].apply(pd.to_numeric, errors="coerce")
+
+    for col in RANGE_COLS:
+        if col not in df.columns:
+            continue
+        values = df.pop(col).tolist()
+        try:
+            # Fast path: every entry is a [lo, hi] pair
+            pairs = np.array(values, dtype=float)
+            if pairs.shape != (len(values), 2):
+                raise ValueError("not a list of [lo, hi] pairs")
+        except (TypeError, ValueError):
+            pairs = np.array(
+                [r if isinstance(r, (list, tuple)) and len(r) == 2 else (np.nan, np.nan)
+                 for r in values],
+                dtype=float,
+            ).reshape(-1, 2)
+        df[f"{col}_lo"] = pairs[:, 0]
+        df[f"{col}_hi"] = pairs[:, 1]
+    return df
+
+
+_DF_CACHE: OrderedDict[int, tuple[Hourly, pd.DataFrame]] = OrderedDict()
+_DF_CACHE_SIZE = 4
+_DF_CACHE_LOCK = threading.Lock()
+
+
+def _cached_df(hourly: Hourly) -> pd.DataFrame:
+    """``_build_df`` memoized on the identity of the ``hourly`` object.
+
+    The entry keeps a reference to it, so its id can't be recycled while
+    cached.  Callers must treat both the input and the frame as read-only.
+    """
+    key = id(hourly)
+    with _DF_CACHE_LOCK:
+        entry = _DF_CACHE.get(key)
+        if entry is not None and entry[0] is hourly:
+            _DF_CACHE.move_to_end(key)
+            return entry[1]
+
+    df = _build_df(hourly)
+    with _DF_CACHE_LOCK:
+        _DF_CACHE[key] = (hourly, df)
+        while len(_DF_CACHE) > _DF_CACHE_SIZE:
+            _DF_CACHE.popitem(last=False)
     return df
 
 
+def _day_starts(times: pd.DatetimeIndex) -> np.ndarray:
+    """Matplotlib date numbers of each midnight from the first to the last day."""
+    days = pd.date_range(times.min().normalize(), times.max().normalize(), freq="D")
+    return mdates.date2num(days)
+
+
+def _shade_nights(ax, times: pd.DatetimeIndex) -> None:
+    """Shade 20:00–08:00 each night with one collection instead of an axvspan per day."""
+    days = _day_starts(times)
+    starts, ends = days + 20 / 24, days + 32 / 24
+    x = np.column_stack([starts, ends, ends, starts])
+    verts = np.stack([x, np.broadcast_to([0, 0, 1, 1], x.shape)], axis=-1)
+    ax.add_collection(PolyCollection(
+        verts, transform=ax.get_xaxis_transform(), color="white",
+        linewidth=plt.rcParams["patch.linewidth"], alpha=0.08, zorder=0,
+    ), autolim=False)
+    # like axvspan, the spans count towards the x (but not y) data limits
+    if len(days):
+        ax.update_datalim([(starts[0], 0), (ends[-1], 0)], updatey=False)
+        ax.autoscale_view(scaley=False)
+
+
+def _draw_day_separators(ax, days: np.ndarray) -> None:
+    """Thin vertical line at each midnight, as one LineCollection."""
+    x = np.column_stack([days, days])
+    ax.add_collection(LineCollection(
+        np.stack([x, np.broadcast_to([0, 1], x.shape)], axis=-1),
+        transform=ax.get_xaxis_transform(which="grid"),
+        color=COLORS["subtext"], linewidth=0.3, alpha=0.5,
+    ), autolim=False)
+    if len(days):
+        ax.update_datalim([(days[0], 0), (days[-1], 0)], updatey=False)
+        ax.autoscale_view(scaley=False)
+
+
 # ═══════════════════════════════════════════════════════
 #  Individual Charts
 # ═══════════════════════════════════════════════════════
 
-def chart_temperature(df: pd.DataFrame) -> str:
-    _apply_dark_theme()
-    fig, ax = plt.subplots(figsize=(14, 3.5))
-    times = df.index
+def chart_temperature(df: pd.DataFrame, path: Path | None = None) -> bytes | Path:
+    with _cached_figure("temperature", figsize=(14, 3.5)) as (fig, ax):
+        times = df.index
 
-    if "temperature_range_c" in df.columns:
-        try:
-            lows = [r[0] if isinstance(r, list) else np.nan for r in df["temperature_range_c"]]
-            highs = [r[1] if isinstance(r, list) else np.nan for r in df["temperature_range_c"]]
+        if "temperature_range_c_lo" in df.columns:
+            lows = df["temperature_range_c_lo"].to_numpy()
+            highs = df["temperature_range_c_hi"].to_numpy()
             ax.fill_between(times, lows, highs,
                             alpha=0.15, color=COLORS["temp_band"], label="10th–90th percentile")
-        except (TypeError, IndexError):
-            pass
-
-    ax.plot(times, df["temperature_c"], color=COLORS["temp"],
-            linewidth=2, label="Temperature", zorder=5)
-
-    for day in pd.date_range(times.min().normalize(), times.max().normalize(), freq="D"):
-        night_start = day + pd.Timedelta(hours=20)
-        night_end = day + pd.Timedelta(hours=32)
-        ax.axvspan(night_start, night_end, alpha=0.08, color="white", zorder=0)
-
-    if len(df) > 0:
-        idx_max = df["temperature_c"].idxmax()
-        idx_min = df["temperature_c"].idxmin()
-        ax.annotate(f'{df["temperature_c"].max():.1f}°',
-                    xy=(idx_max, df["temperature_c"].max()),
-                    xytext=(0, 12), textcoords="offset points",
-                    ha="center", fontsize=9, fontweight="bold",
-                    color=COLORS["danger"],
-                    arrowprops=dict(arrowstyle="-", color=COLORS["danger"], lw=0.8))
-        ax.annotate(f'{df["temperature_c"].min():.1f}°',
-                    xy=(idx_min, df["temperature_c"].min()),
-                    xytext=(0, -16), textcoords="offset points",
-                    ha="center", fontsize=9, fontweight="bold",
-                    color=COLORS["accent"],
-                    arrowprops=dict(arrowstyle="-", color=COLORS["accent"], lw=0.8))
-
-    ax.set_ylabel("Temperature (°C)", color=COLORS["text"])
-    ax.set_title("Temperature Forecast", fontsize=13, fontweight="bold",
-                 color=COLORS["title"], pad=12)
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%a %d\n%H:%M"))
-    ax.xaxis.set_major_locator(mdates.DayLocator())
-    ax.xaxis.set_minor_locator(mdates.HourLocator(byhour=[6, 12, 18]))
-    ax.legend(loc="upper right")
-    fig.autofmt_xdate(rotation=0, ha="center")
-
-    return _fig_to_base64(fig)
-
-
-def chart_precipitation(df: pd.DataFrame) -> str:
-    _apply_dark_theme()
-    fig, ax1 = plt.subplots(figsize=(14, 3.5))
-    times = df.index
-    width = pd.Timedelta(minutes=45)
-
-    rain = df["precip_expected_mm"].fillna(0)
-    bar_colors = [COLORS["rain_bar"] if r > 0.1 else COLORS["grid"] for r in rain]
-    ax1.bar(times, rain, width=width, color=bar_colors, alpha=0.7,
-            label="Expected rainfall", zorder=3)
-
-    if "precip_range_mm" in df.columns:
-        try:
-            lows = [r[0] if isinstance(r, list) else 0 for r in df["precip_range_mm"]]
-            highs = [r[1] if isinstance(r, list) else 0 for r in df["precip_range_mm"]]
+
+        ax.plot(times, df["temperature_c"], color=COLORS["temp"],
+                linewidth=2, label="Temperature", zorder=5)
+
+        _shade_nights(ax, times)
+
+        if len(df) > 0:
+            idx_max = df["temperature_c"].idxmax()
+            idx_min = df["temperature_c"].idxmin()
+            ax.annotate(f'{df["temperature_c"].max():.1f}°',
+                        xy=(idx_max, df["temperature_c"].max()),
+                        xytext=(0, 12), textcoords="offset points",
+                        ha="center", fontsize=9, fontweight="bold",
+                        color=COLORS["danger"],
+                        arrowprops=dict(arrowstyle="-", color=COLORS["danger"], lw=0.8))
+            ax.annotate(f'{df["temperature_c"].min():.1f}°',
+                        xy=(idx_min, df["temperature_c"].min()),
+                        xytext=(0, -16), textcoords="offset points",
+                        ha="center", fontsize=9, fontweight="bold",
+                        color=COLORS["accent"],
+                        arrowprops=dict(arrowstyle="-", color=COLORS["accent"], lw=0.8))
+
+        ax.set_ylabel("Temperature (°C)", color=COLORS["text"])
+        ax.set_title("Temperature Forecast", fontsize=13, fontweight="bold",
+                     color=COLORS["title"], pad=12)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%a %d\n%H:%M"))
+        ax.xaxis.set_major_locator(mdates.DayLocator())
+        ax.xaxis.set_minor_locator(mdates.HourLocator(byhour=[6, 12, 18]))
+        ax.legend(loc="upper right")
+        fig.autofmt_xdate(rotation=0, ha="center")
+
+        return _export(fig, path)
+
+
+def chart_precipitation(df: pd.DataFrame, path: Path | None = None) -> bytes | Path:
+    with _cached_figure("precipitation", figsize=(14, 3.5)) as (fig, ax1):
+        times = df.index
+        width = pd.Timedelta(minutes=45)
+
+        rain = df["precip_expected_mm"].fillna(0)
+        bar_colors = np.where(rain.to_numpy() > 0.1, COLORS["rain_bar"], COLORS["grid"])
+        bars = ax1.bar(times, rain, width=width, color=bar_colors, alpha=0.7,
+                       label="Expected rainfall", zorder=3)
+
+        if "precip_range_mm_lo" in df.columns:
+            lows = np.nan_to_num(df["precip_range_mm_lo"].to_numpy())
+            highs = np.nan_to_num(df["precip_range_mm_hi"].to_numpy())
             ax1.vlines(times, lows, highs, color=COLORS["rain_bar"],
                        alpha=0.3, linewidth=3, zorder=2)
-        except (TypeError, IndexError):
-            pass
-
-    ax1.set_ylabel("Rainfall (mm)", color=COLORS["rain_bar"])
-    ax1.set_ylim(bottom=0)
-    ax1.tick_params(axis="y", colors=COLORS["rain_bar"])
-
-    ax2 = ax1.twinx()
-    prob = df["precip_probability_pct"].fillna(0)
-    ax2.plot(times, prob, color=COLORS["rain_prob"], linewidth=1.5,
-             alpha=0.9, label="Probability", zorder=4)
-    ax2.fill_between(times, 0, prob, alpha=0.05, color=COLORS["rain_prob"])
-    ax2.set_ylabel("Probability (%)", color=COLORS["rain_prob"])
-    ax2.set_ylim(0, 105)
-    ax2.yaxis.set_major_locator(mticker.MultipleLocator(25))
-    ax2.tick_params(axis="y", colors=COLORS["rain_prob"])
-
-    lines1, labels1 = ax1.get_legend_handles_labels()
-    lines2, labels2 = ax2.get_legend_handles_labels()
-    ax1.legend(lines1 + lines2, labels1 + labels2, loc="upper right")
-
-    ax1.set_title("Precipitation Forecast", fontsize=13, fontweight="bold",
-                  color=COLORS["title"], pad=12)
-    ax1.xaxis.set_major_formatter(mdates.DateFormatter("%a %d\n%H:%M"))
-    ax1.xaxis.set_major_locator(mdates.DayLocator())
-    ax1.xaxis.set_minor_locator(mdates.HourLocator(byhour=[6, 12, 18]))
-    fig.autofmt_xdate(rotation=0, ha="center")
-
-    return _fig_to_base64(fig)
-
-
-def chart_wind(df: pd.DataFrame) -> str:
-    _apply_dark_theme()
-    fig, ax = plt.subplots(figsize=(14, 3))
-    times = df.index
-    speed = df["wind_speed_kmh"].fillna(0)
-
-    ax.fill_between(times, 0, speed, alpha=0.3, color=COLORS["wind"], zorder=2)
-    ax.plot(times, speed, color=COLORS["wind"], linewidth=1.5,
-            label="Wind speed", zorder=3)
-
-    ax.axhline(y=20, color=COLORS["warning"], linewidth=0.8,
-               linestyle="--", alpha=0.6, label="Breezy (20 km/h)")
-    ax.axhline(y=40, color=COLORS["danger"], linewidth=0.8,
-               linestyle="--", alpha=0.6, label="Strong (40 km/h)")
-
-    ax.set_ylabel("Wind Speed (km/h)", color=COLORS["text"])
-    ax.set_ylim(bottom=0)
-    ax.set_title("Wind Forecast", fontsize=13, fontweight="bold",
-                 color=COLORS["title"], pad=12)
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%a %d\n%H:%M"))
-    ax.xaxis.set_major_locator(mdates.DayLocator())
-    ax.xaxis.set_minor_locator(mdates.HourLocator(byhour=[6, 12, 18]))
-    ax.legend(loc="upper right")
-    fig.autofmt_xdate(rotation=0, ha="center")
-
-    return _fig_to_base64(fig)
-
-
-def chart_humidity(df: pd.DataFrame) -> str:
-    _apply_dark_theme()
-    fig, ax = plt.subplots(figsize=(14, 2.5))
-    times = df.index
-    hum = df["humidity_pct"].fillna(0)
-
-    ax.axhspan(30, 60, alpha=0.08, color=COLORS["wind"], zorder=0, label="Comfort zone")
-    ax.fill_between(times, 0, hum, alpha=0.2, color=COLORS["humidity"], zorder=2)
-    ax.plot(times, hum, color=COLORS["humidity"], linewidth=1.5, zorder=3)
-
-    ax.set_ylabel("Humidity (%)", color=COLORS["text"])
-    ax.set_ylim(0, 105)
-    ax.yaxis.set_major_locator(mticker.MultipleLocator(25))
-    ax.set_title("Humidity Forecast", fontsize=13, fontweight="bold",
-                 color=COLORS["title"], pad=12)
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%a %d\n%H:%M"))
-    ax.xaxis.set_major_locator(mdates.DayLocator())
-    ax.legend(loc="upper right")
-    fig.autofmt_xdate(rotation=0, ha="center")
-
-    return _fig_to_base64(fig)
-
-
-def chart_daily_summary(df: pd.DataFrame) -> str:
-    _apply_dark_theme()
-    sns.set_theme(style="dark", rc={
-        "axes.facecolor": COLORS["panel"],
-        "figure.facecolor": COLORS["bg"],
-        "text.color": COLORS["text"],
-        "axes.labelcolor": COLORS["text"],
-        "xtick.color": COLORS["tick"],
-        "ytick.color": COLORS["tick"],
-    })
 
+        ax1.set_ylabel("Rainfall (mm)", color=COLORS["rain_bar"])
+        ax1.set_ylim(bottom=0)
+        ax1.tick_params(axis="y", colors=COLORS["rain_bar"])
+
+        # Probability (0–105 %) is drawn on the rain axis, rescaled to its
+        # range, with a secondary y-axis for the % ticks — cheaper than a
+        # full twinx() Axes and keeps the legend on one axes.
+        rain_top = ax1.get_ylim()[1]
+        if rain_top <= 0:
+            rain_top = 1.0
+        ax1.set_ylim(0, rain_top)
+        scale = rain_top / 105
+        prob = df["precip_probability_pct"].fillna(0).to_numpy() * scale
+        prob_line, = ax1.plot(times, prob, color=COLORS["rain_prob"], linewidth=1.5,
+                              alpha=0.9, label="Probability", zorder=4)
+        ax1.fill_between(times, 0, prob, alpha=0.05, color=COLORS["rain_prob"])
+        sec = ax1.secondary_yaxis("right", functions=(lambda y: y / scale,
+                                                      lambda p: p * scale))
+        sec.set_ylabel("Probability (%)", color=COLORS["rain_prob"])
+        sec.yaxis.set_major_locator(mticker.MultipleLocator(25))
+        sec.tick_params(axis="y", colors=COLORS["rain_prob"])
+
+        ax1.legend(handles=[bars, prob_line], loc="upper right")
+
+        ax1.set_title("Precipitation Forecast", fontsize=13, fontweight="bold",
+                      color=COLORS["title"], pad=12)
+        ax1.xaxis.set_major_formatter(mdates.DateFormatter("%a %d\n%H:%M"))
+        ax1.xaxis.set_major_locator(mdates.DayLocator())
+        ax1.xaxis.set_minor_locator(mdates.HourLocator(byhour=[6, 12, 18]))
+        fig.autofmt_xdate(rotation=0, ha="center")
+
+        return _export(fig, path)
+
+
+def chart_wind(df: pd.DataFrame, path: Path | None = None) -> bytes | Path:
+    with _cached_figure("wind", figsize=(14, 3)) as (fig, ax):
+        times = df.index
+        speed = df["wind_speed_kmh"].fillna(0)
+
+        ax.fill_between(times, 0, speed, alpha=0.3, color=COLORS["wind"], zorder=2)
+        ax.plot(times, speed, color=COLORS["wind"], linewidth=1.5,
+                label="Wind speed", zorder=3)
+
+        ax.axhline(y=20, color=COLORS["warning"], linewidth=0.8,
+                   linestyle="--", alpha=0.6, label="Breezy (20 km/h)")
+        ax.axhline(y=40, color=COLORS["danger"], linewidth=0.8,
+                   linestyle="--", alpha=0.6, label="Strong (40 km/h)")
+
+        ax.set_ylabel("Wind Speed (km/h)", color=COLORS["text"])
+        ax.set_ylim(bottom=0)
+        ax.set_title("Wind Forecast", fontsize=13, fontweight="bold",
+                     color=COLORS["title"], pad=12)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%a %d\n%H:%M"))
+        ax.xaxis.set_major_locator(mdates.DayLocator())
+        ax.xaxis.set_minor_locator(mdates.HourLocator(byhour=[6, 12, 18]))
+        ax.legend(loc="upper right")
+        fig.autofmt_xdate(rotation=0, ha="center")
+
+        return _export(fig, path)
+
+
+def chart_humidity(df: pd.DataFrame, path: Path | None = None) -> bytes | Path:
+    with _cached_figure("humidity", figsize=(14, 2.5)) as (fig, ax):
+        times = df.index
+        hum = df["humidity_pct"].fillna(0)
+
+        ax.axhspan(30, 60, alpha=0.08, color=COLORS["wind"], zorder=0, label="Comfort zone")
+        ax.fill_between(times, 0, hum, alpha=0.2, color=COLORS["humidity"], zorder=2)
+        ax.plot(times, hum, color=COLORS["humidity"], linewidth=1.5, zorder=3)
+
+        ax.set_ylabel("Humidity (%)", color=COLORS["text"])
+        ax.set_ylim(0, 105)
+        ax.yaxis.set_major_locator(mticker.MultipleLocator(25))
+        ax.set_title("Humidity Forecast", fontsize=13, fontweight="bold",
+                     color=COLORS["title"], pad=12)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%a %d\n%H:%M"))
+        ax.xaxis.set_major_locator(mdates.DayLocator())
+        ax.legend(loc="upper right")
+        fig.autofmt_xdate(rotation=0, ha="center")
+
+        return _export(fig, path)
+
+
+def chart_daily_summary(df: pd.DataFrame, path: Path | None = None) -> bytes | Path:
     daily = df.resample("D").agg({
         "temperature_c": ["min", "max", "mean"],
         "precip_expected_mm": "sum",
@@ -260,188 +438,222 @@ def chart_daily_summary(df: pd.DataFrame) -> str:
     daily.columns = ["temp_min", "temp_max", "temp_mean",
                      "rain_total", "rain_prob_max", "wind_max", "humidity_mean"]
     daily = daily.dropna()
+    # One float block, sliced per panel, instead of boxing a Series per loop
+    (temp_min, temp_max, _, rain_total, rain_prob_max,
+     wind_max, humidity_mean) = daily.to_numpy(dtype=float).T
 
     if len(daily) == 0:
-        fig, ax = plt.subplots(figsize=(14, 2))
-        ax.text(0.5, 0.5, "No daily data available", ha="center", va="center",
-                transform=ax.transAxes, color=COLORS["text"])
-        return _fig_to_base64(fig)
-
-    fig, axes = plt.subplots(1, 5, figsize=(14, 3.2),
-                              gridspec_kw={"wspace": 0.4})
-    fig.suptitle("Daily Summary", fontsize=13, fontweight="bold",
-                 color=COLORS["title"], y=1.02)
-
-    day_labels = [d.strftime("%a\n%b %d") for d in daily.index]
-    x = range(len(daily))
-
-    # 1) Temperature range
-    ax = axes[0]
-    ax.bar(x, daily["temp_max"] - daily["temp_min"],
-           bottom=daily["temp_min"], color=COLORS["temp"], alpha=0.7, width=0.6)
-    for i, (lo, hi) in enumerate(zip(daily["temp_min"], daily["temp_max"])):
-        ax.text(i, hi + 0.3, f"{hi:.0f}°", ha="center", fontsize=7,
-                color=COLORS["text"], fontweight="bold")
-        ax.text(i, lo - 1.2, f"{lo:.0f}°", ha="center", fontsize=7,
-                color=COLORS["subtext"])
-    ax.set_xticks(x)
-    ax.set_xticklabels(day_labels, fontsize=7, color=COLORS["tick"])
-    ax.set_title("Temp Range", fontsize=9, color=COLORS["text"])
-    ax.set_ylabel("°C", fontsize=8, color=COLORS["text"])
-
-    # 2) Rain total
-    ax = axes[1]
-    colors = [COLORS["rain_bar"] if r > 1 else COLORS["grid"] for r in daily["rain_total"]]
-    ax.bar(x, daily["rain_total"], color=colors, alpha=0.8, width=0.6)
-    for i, v in enumerate(daily["rain_total"]):
-        if v > 0.1:
-            ax.text(i, v + 0.1, f"{v:.1f}", ha="center", fontsize=7,
+        with _cached_figure("daily_summary_empty", figsize=(14, 2)) as (fig, ax):
+            ax.text(0.5, 0.5, "No daily data available", ha="center", va="center",
+                    transform=ax.transAxes, color=COLORS["text"])
+            return _export(fig, path)
+
+    with _cached_figure("daily_summary", 1, 5, figsize=(14, 3.2),
+                        gridspec_kw={"wspace": 0.4}) as (fig, axes):
+        fig.suptitle("Daily Summary", fontsize=13, fontweight="bold",
+                     color=COLORS["title"], y=1.02)
+
+        day_labels = [d.strftime("%a\n%b %d") for d in daily.index]
+        x = np.arange(len(daily))
+
+        # 1) Temperature range
+        ax = axes[0]
+        ax.bar(x, temp_max - temp_min,
+               bottom=temp_min, color=COLORS["temp"], alpha=0.7, width=0.6,
+               edgecolor="white")
+        for i, lo, hi in zip(x, temp_min, temp_max):
+            ax.text(i, hi + 0.3, f"{hi:.0f}°", ha="center", fontsize=7,
                     color=COLORS["text"], fontweight="bold")
-    ax.set_xticks(x)
-    ax.set_xticklabels(day_labels, fontsize=7, color=COLORS["tick"])
-    ax.set_title("Rain (mm)", fontsize=9, color=COLORS["text"])
-    ax.set_ylim(bottom=0)
-
-    # 3) Rain probability
-    ax = axes[2]
-    colors = [COLORS["danger"] if p >= 70 else COLORS["rain_prob"] if p >= 30
-              else COLORS["grid"] for p in daily["rain_prob_max"]]
-    ax.bar(x, daily["rain_prob_max"], color=colors, alpha=0.8, width=0.6)
-    for i, v in enumerate(daily["rain_prob_max"]):
-        ax.text(i, v + 2, f"{v:.0f}%", ha="center", fontsize=7,
-                color=COLORS["text"], fontweight="bold")
-    ax.set_xticks(x)
-    ax.set_xticklabels(day_labels, fontsize=7, color=COLORS["tick"])
-    ax.set_title("Max P(Rain)", fontsize=9, color=COLORS["text"])
-    ax.set_ylim(0, 110)
-
-    # 4) Max wind
-    ax = axes[3]
-    colors = [COLORS["danger"] if w >= 40 else COLORS["warning"] if w >= 20
-              else COLORS["wind"] for w in daily["wind_max"]]
-    ax.bar(x, daily["wind_max"], color=colors, alpha=0.8, width=0.6)
-    for i, v in enumerate(daily["wind_max"]):
-        ax.text(i, v + 0.5, f"{v:.0f}", ha="center", fontsize=7,
-                color=COLORS["text"], fontweight="bold")
-    ax.set_xticks(x)
-    ax.set_xticklabels(day_labels, fontsize=7, color=COLORS["tick"])
-    ax.set_title("Max Wind", fontsize=9, color=COLORS["text"])
-    ax.set_ylabel("km/h", fontsize=8, color=COLORS["text"])
-    ax.set_ylim(bottom=0)
-
-    # 5) Mean humidity
-    ax = axes[4]
-    ax.bar(x, daily["humidity_mean"], color=COLORS["humidity"], alpha=0.6, width=0.6)
-    for i, v in enumerate(daily["humidity_mean"]):
-        ax.text(i, v + 1, f"{v:.0f}%", ha="center", fontsize=7,
-                color=COLORS["text"], fontweight="bold")
-    ax.set_xticks(x)
-    ax.set_xticklabels(day_labels, fontsize=7, color=COLORS["tick"])
-    ax.set_title("Avg Humidity", fontsize=9, color=COLORS["text"])
-    ax.set_ylim(0, 110)
-
-    # Force white ticks on all panels
-    for ax in axes:
-        ax.tick_params(colors=COLORS["tick"])
-        for spine in ax.spines.values():
-            spine.set_color(COLORS["grid"])
-
-    return _fig_to_base64(fig)
-
-
-def chart_combined_overview(df: pd.DataFrame) -> str:
-    _apply_dark_theme()
-
-    fig, (ax1, ax2, ax3, ax4) = plt.subplots(
-        4, 1, figsize=(14, 10), sharex=True,
-        gridspec_kw={"hspace": 0.12, "height_ratios": [3, 3, 2, 2]}
-    )
-    times = df.index
-
-    # Panel 1: Temperature
-    ax1.plot(times, df["temperature_c"], color=COLORS["temp"], linewidth=2)
-    if "temperature_range_c" in df.columns:
-        try:
-            lows = [r[0] if isinstance(r, list) else np.nan for r in df["temperature_range_c"]]
-            highs = [r[1] if isinstance(r, list) else np.nan for r in df["temperature_range_c"]]
-            ax1.fill_between(times, lows, highs, alpha=0.12, color=COLORS["temp_band"])
-        except (TypeError, IndexError):
-            pass
-    ax1.set_ylabel("Temp (°C)", fontsize=9, color=COLORS["text"])
-    ax1.set_title("7-Day Weather Overview", fontsize=14, fontweight="bold",
-                  color=COLORS["title"], pad=15)
-
-    # Panel 2: Precipitation
-    rain = df["precip_expected_mm"].fillna(0)
-    prob = df["precip_probability_pct"].fillna(0)
-    ax2.bar(times, rain, width=pd.Timedelta(minutes=45),
-            color=COLORS["rain_bar"], alpha=0.7, label="Rain (mm)")
-    ax2.set_ylabel("Rain (mm)", fontsize=9, color=COLORS["text"])
-    ax2.set_ylim(bottom=0)
-
-    ax2b = ax2.twinx()
-    ax2b.plot(times, prob, color=COLORS["rain_prob"], linewidth=1.2, alpha=0.8)
-    ax2b.set_ylabel("Prob %", fontsize=8, color=COLORS["rain_prob"])
-    ax2b.set_ylim(0, 105)
-    ax2b.tick_params(axis="y", colors=COLORS["rain_prob"])
-
-    # Panel 3: Wind
-    ax3.fill_between(times, 0, df["wind_speed_kmh"].fillna(0),
-                     alpha=0.3, color=COLORS["wind"])
-    ax3.plot(times, df["wind_speed_kmh"], color=COLORS["wind"], linewidth=1.2)
-    ax3.set_ylabel("Wind (km/h)", fontsize=9, color=COLORS["text"])
-    ax3.set_ylim(bottom=0)
-
-    # Panel 4: Humidity
-    ax4.fill_between(times, 0, df["humidity_pct"].fillna(0),
-                     alpha=0.2, color=COLORS["humidity"])
-    ax4.plot(times, df["humidity_pct"], color=COLORS["humidity"], linewidth=1.2)
-    ax4.set_ylabel("Humidity %", fontsize=9, color=COLORS["text"])
-    ax4.set_ylim(0, 105)
-
-    # Day separators + white ticks on all panels
-    for ax in [ax1, ax2, ax3, ax4]:
-        for day in pd.date_range(times.min().normalize(), times.max().normalize(), freq="D"):
-            ax.axvline(day, color=COLORS["subtext"], linewidth=0.3, alpha=0.5)
-        ax.tick_params(colors=COLORS["tick"])
-        ax.yaxis.label.set_color(COLORS["text"])
-        for spine in ax.spines.values():
-            spine.set_color(COLORS["grid"])
-
-    ax4.xaxis.set_major_formatter(mdates.DateFormatter("%a %b %d"))
-    ax4.xaxis.set_major_locator(mdates.DayLocator())
-    fig.autofmt_xdate(rotation=0, ha="center")
-
-    return _fig_to_base64(fig)
+            ax.text(i, lo - 1.2, f"{lo:.0f}°", ha="center", fontsize=7,
+                    color=COLORS["subtext"])
+        ax.set_xticks(x)
+        ax.set_xticklabels(day_labels, fontsize=7, color=COLORS["tick"])
+        ax.set_title("Temp Range", fontsize=9, color=COLORS["text"])
+        ax.set_ylabel("°C", fontsize=8, color=COLORS["text"])
+
+        # 2) Rain total
+        ax = axes[1]
+        colors = np.where(rain_total > 1, COLORS["rain_bar"], COLORS["grid"])
+        ax.bar(x, rain_total, color=colors, alpha=0.8, width=0.6,
+               edgecolor="white")
+        for i, v in zip(x, rain_total):
+            if v > 0.1:
+                ax.text(i, v + 0.1, f"{v:.1f}", ha="center", fontsize=7,
+                        color=COLORS["text"], fontweight="bold")
+        ax.set_xticks(x)
+        ax.set_xticklabels(day_labels, fontsize=7, color=COLORS["tick"])
+        ax.set_title("Rain (mm)", fontsize=9, color=COLORS["text"])
+        ax.set_ylim(bottom=0)
+
+        # 3) Rain probability
+        ax = axes[2]
+        colors = np.select([rain_prob_max >= 70, rain_prob_max >= 30],
+                           [COLORS["danger"], COLORS["rain_prob"]], COLORS["grid"])
+        ax.bar(x, rain_prob_max, color=colors, alpha=0.8, width=0.6,
+               edgecolor="white")
+        for i, v in zip(x, rain_prob_max):
+            ax.text(i, v + 2, f"{v:.0f}%", ha="center", fontsize=7,
+                    color=COLORS["text"], fontweight="bold")
+        ax.set_xticks(x)
+        ax.set_xticklabels(day_labels, fontsize=7, color=COLORS["tick"])
+        ax.set_title("Max P(Rain)", fontsize=9, color=COLORS["text"])
+        ax.set_ylim(0, 110)
+
+        # 4) Max wind
+        ax = axes[3]
+        colors = np.select([wind_max >= 40, wind_max >= 20],
+                           [COLORS["danger"], COLORS["warning"]], COLORS["wind"])
+        ax.bar(x, wind_max, color=colors, alpha=0.8, width=0.6,
+               edgecolor="white")
+        for i, v in zip(x, wind_max):
+            ax.text(i, v + 0.5, f"{v:.0f}", ha="center", fontsize=7,
+                    color=COLORS["text"], fontweight="bold")
+        ax.set_xticks(x)
+        ax.set_xticklabels(day_labels, fontsize=7, color=COLORS["tick"])
+        ax.set_title("Max Wind", fontsize=9, color=COLORS["text"])
+        ax.set_ylabel("km/h", fontsize=8, color=COLORS["text"])
+        ax.set_ylim(bottom=0)
+
+        # 5) Mean humidity
+        ax = axes[4]
+        ax.bar(x, humidity_mean, color=COLORS["humidity"], alpha=0.6, width=0.6,
+               edgecolor="white")
+        for i, v in zip(x, humidity_mean):
+            ax.text(i, v + 1, f"{v:.0f}%", ha="center", fontsize=7,
+                    color=COLORS["text"], fontweight="bold")
+        ax.set_xticks(x)
+        ax.set_xticklabels(day_labels, fontsize=7, color=COLORS["tick"])
+        ax.set_title("Avg Humidity", fontsize=9, color=COLORS["text"])
+        ax.set_ylim(0, 110)
+
+        # White ticks without tick marks, and no grid, on all panels
+        for ax in axes:
+            ax.grid(False)
+            ax.tick_params(colors=COLORS["tick"], length=0)
+            for spine in ax.spines.values():
+                spine.set_color(COLORS["grid"])
+
+        return _export(fig, path)
+
+
+def chart_combined_overview(df: pd.DataFrame, path: Path | None = None) -> bytes | Path:
+    with _cached_figure(
+        "overview", 4, 1, figsize=(14, 10), sharex=True,
+        gridspec_kw={"hspace": 0.12, "height_ratios": [3, 3, 2, 2]},
+    ) as (fig, (ax1, ax2, ax3, ax4)):
+        times = df.index
+
+        # Panel 1: Temperature
+        ax1.plot(times, df["temperature_c"], color=COLORS["temp"], linewidth=2)
+        if "temperature_range_c_lo" in df.columns:
+            lows = df["temperature_range_c_lo"].to_numpy()
+            highs = df["temperature_range_c_hi"].to_numpy()
+            ax1.fill_between(times, lows, highs,
+                             alpha=0.12, color=COLORS["temp_band"])
+        ax1.set_ylabel("Temp (°C)", fontsize=9, color=COLORS["text"])
+        ax1.set_title("7-Day Weather Overview", fontsize=14, fontweight="bold",
+                      color=COLORS["title"], pad=15)
+
+        # Panel 2: Precipitation
+        rain = df["precip_expected_mm"].fillna(0)
+        prob = df["precip_probability_pct"].fillna(0)
+        ax2.bar(times, rain, width=pd.Timedelta(minutes=45),
+                color=COLORS["rain_bar"], alpha=0.7, label="Rain (mm)")
+        ax2.set_ylabel("Rain (mm)", fontsize=9, color=COLORS["text"])
+        ax2.set_ylim(bottom=0)
+
+        ax2b = _twinx(ax2)
+        ax2b.plot(times, prob, color=COLORS["rain_prob"], linewidth=1.2, alpha=0.8)
+        ax2b.set_ylabel("Prob %", fontsize=8, color=COLORS["rain_prob"])
+        ax2b.set_ylim(0, 105)
+        ax2b.tick_params(axis="y", colors=COLORS["rain_prob"])
+
+        # Panel 3: Wind
+        ax3.fill_between(times, 0, df["wind_speed_kmh"].fillna(0),
+                         alpha=0.3, color=COLORS["wind"])
+        ax3.plot(times, df["wind_speed_kmh"], color=COLORS["wind"], linewidth=1.2)
+        ax3.set_ylabel("Wind (km/h)", fontsize=9, color=COLORS["text"])
+        ax3.set_ylim(bottom=0)
+
+        # Panel 4: Humidity
+        ax4.fill_between(times, 0, df["humidity_pct"].fillna(0),
+                         alpha=0.2, color=COLORS["humidity"])
+        ax4.plot(times, df["humidity_pct"], color=COLORS["humidity"], linewidth=1.2)
+        ax4.set_ylabel("Humidity %", fontsize=9, color=COLORS["text"])
+        ax4.set_ylim(0, 105)
+
+        # Day separators + white ticks on all panels
+        days = _day_starts(times)
+        for ax in [ax1, ax2, ax3, ax4]:
+            _draw_day_separators(ax, days)
+            ax.tick_params(colors=COLORS["tick"])
+            ax.yaxis.label.set_color(COLORS["text"])
+            for spine in ax.spines.values():
+                spine.set_color(COLORS["grid"])
+
+        ax4.xaxis.set_major_formatter(mdates.DateFormatter("%a %b %d"))
+        ax4.xaxis.set_major_locator(mdates.DayLocator())
+        fig.autofmt_xdate(rotation=0, ha="center")
+
+        return _export(fig, path)
 
 
 # ═══════════════════════════════════════════════════════
 #  Public API
 # ═══════════════════════════════════════════════════════
 
-def generate_all_charts(hourly: list[dict]) -> dict[str, str]:
-    df = _build_df(hourly)
-    return {
-        "overview": chart_combined_overview(df),
-        "temperature": chart_temperature(df),
-        "precipitation": chart_precipitation(df),
-        "wind": chart_wind(df),
-        "humidity": chart_humidity(df),
-        "daily_summary": chart_daily_summary(df),
-    }
+CHART_FNS = {
+    "overview": chart_combined_overview,
+    "temperature": chart_temperature,
+    "precipitation": chart_precipitation,
+    "wind": chart_wind,
+    "humidity": chart_humidity,
+    "daily_summary": chart_daily_summary,
+}
 
 
-def generate_single_chart(hourly: list[dict], name: str) -> str | None:
-    df = _build_df(hourly)
-    chart_fns = {
-        "overview": chart_combined_overview,
-        "temperature": chart_temperature,
-        "precipitation": chart_precipitation,
-        "wind": chart_wind,
-        "humidity": chart_humidity,
-        "daily_summary": chart_daily_summary,
-    }
-    fn = chart_fns.get(name)
+_POOL: ThreadPoolExecutor | None = None
+_POOL_PID: int | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _render_pool() -> ThreadPoolExecutor:
+    """Process-wide chart render pool, started on first use.
+
+    Keyed by pid: a pool inherited over fork (gunicorn preload) has no
+    live threads, so each worker starts its own.
+    """
+    global _POOL, _POOL_PID
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PID != os.getpid():
+            workers = min(len(CHART_FNS), os.cpu_count() or 1)
+            _POOL = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="charts")
+            _POOL_PID = os.getpid()
+        return _POOL
+
+
+def generate_all_charts(hourly: Hourly, out_dir: Path = CHART_DIR) -> dict[str, Path]:
+    """Render every chart to ``<out_dir>/<name>.<CHART_FORMAT>`` and return the paths.
+
+    Charts draw on separate cached figures, so they render on a thread pool
+    (Agg rasterizing and image compression release the GIL).
+    """
+    df = _cached_df(hourly)
+    pool = _render_pool()
+    futures = {name: pool.submit(fn, df, out_dir / f"{name}.{CHART_FORMAT}")
+               for name, fn in CHART_FNS.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def generate_chart_png(hourly: Hourly, name: str) -> bytes | None:
+    """Render chart ``name`` to PNG bytes; None for an unknown name."""
+    fn = CHART_FNS.get(name)
     if fn is None:
         return None
-    return fn(df)
\ No newline at end of file
+    return fn(_cached_df(hourly))
+
+
+def generate_single_chart(hourly: Hourly, name: str) -> str | None:
+    """``generate_chart_png`` as a base64 string."""
+    png = generate_chart_png(hourly, name)
+    return None if png is None else _b64encode(png)
@@ -8,14 +8,22 @@ Usage:
 Cron:  0 */6 * * *  cd $PROJECT && uv run python collector.py
 """
 import sys
+import threading
 import time as _time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime, timedelta, timezone
+from itertools import islice
 
 import requests
 
 import config
 import db
 
+# One keep-alive connection pool for all Open-Meteo calls
+SESSION = requests.Session()
+
 
 # ═══════════════════════════════════════════════════════
 #  API Fetchers
@@ -23,7 +31,7 @@ import db
 
 def fetch_forecast() -> dict:
     """Current forecast from the live API."""
-    resp = requests.get(
+    resp = SESSION.get(
         "https://api.open-meteo.com/v1/forecast",
         params={
             "latitude": config.LATITUDE,
@@ -41,7 +49,7 @@ def fetch_forecast() -> dict:
 
 def fetch_history(start_date: str, end_date: str) -> dict:
     """Historical observations (ERA5 reanalysis) from the archive API."""
-    resp = requests.get(
+    resp = SESSION.get(
         "https://archive-api.open-meteo.com/v1/archive",
         params={
             "latitude": config.LATITUDE,
@@ -59,7 +67,7 @@ def fetch_history(start_date: str, end_date: str) -> dict:
 
 def fetch_historical_forecast(start_date: str, end_date: str) -> dict:
     """What NWP models actually predicted for past dates."""
-    resp = requests.get(
+    resp = SESSION.get(
         config.HISTORICAL_FORECAST_URL,
         params={
             "latitude": config.LATITUDE,
@@ -79,18 +87,28 @@ def fetch_historical_forecast(start_date: str, end_date: str) -> dict:
 #  Storage helpers
 # ═══════════════════════════════════════════════════════
 
+def _rows_from_columns(hourly: dict, variables: list[str], **extra) -> list[dict]:
+    """Zip Open-Meteo's column-major ``hourly`` block into row dicts.
+
+    Each column is looked up once; variables missing from the response
+    share a single ``[None] * n`` column.
+    """
+    n = len(hourly["time"])
+    missing = [None] * n
+    columns = {"time": hourly["time"], **extra}
+    for var in variables:
+        columns[var] = hourly.get(var) or missing
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
 def store_forecast(data: dict) -> None:
     """Store live forecast data."""
     fetched_at = datetime.now(timezone.utc).isoformat()
     hourly = data["hourly"]
     n = len(hourly["time"])
 
-    rows = []
-    for i in range(n):
-        row = {"time": hourly["time"][i], "lead_hours": i}
-        for var in config.HOURLY_FORECAST_VARS:
-            row[var] = hourly.get(var, [None] * n)[i]
-        rows.append(row)
+    rows = _rows_from_columns(hourly, config.HOURLY_FORECAST_VARS, lead_hours=range(n))
 
     db.insert_forecasts(rows, source="best_match", fetched_at=fetched_at)
     print(f"[collector] Stored {n} forecast rows ({fetched_at})")
@@ -102,16 +120,9 @@ def store_historical_forecast_chunk(data: dict) -> None:
     hourly = data["hourly"]
     n = len(hourly["time"])
 
-    rows = []
-    for i in range(n):
-        row = {"time": hourly["time"][i], "lead_hours": None}
-        for var in config.HOURLY_HISTORICAL_FORECAST_VARS:
-            row[var] = hourly.get(var, [None] * n)[i]
-        # Variables not in historical set → None
-        for var in config.HOURLY_FORECAST_VARS:
-            if var not in row:
-                row[var] = None
-        rows.append(row)
+    # lead_hours and variables not in the historical set are left out of
+    # the rows → stored as NULL
+    rows = _rows_from_columns(hourly, config.HOURLY_HISTORICAL_FORECAST_VARS)
 
     db.insert_forecasts(rows, source="best_match", fetched_at=fetched_at)
     print(f"[collector] Stored {n} historical forecast rows")
@@ -122,12 +133,7 @@ def store_history(data: dict) -> None:
     hourly = data["hourly"]
     n = len(hourly["time"])
 
-    rows = []
-    for i in range(n):
-        row = {"time": hourly["time"][i]}
-        for var in config.HOURLY_HISTORY_VARS:
-            row[var] = hourly.get(var, [None] * n)[i]
-        rows.append(row)
+    rows = _rows_from_columns(hourly, config.HOURLY_HISTORY_VARS)
 
     db.insert_observations(rows)
     print(f"[collector] Stored {n} observation rows")
@@ -148,62 +154,124 @@ def backfill_forecasts() -> None:
     """Seed database with historical NWP forecast data."""
     end = datetime.now(timezone.utc) - timedelta(days=5)
     start = end - timedelta(days=365 * config.HISTORY_YEARS)
-    _chunked_fetch(
-        start, end,
-        fetch_historical_forecast,
-        store_historical_forecast_chunk,
-        "historical forecasts",
-    )
+    with db.bulk_load_forecasts():
+        _chunked_fetch(
+            start, end,
+            fetch_historical_forecast,
+            store_historical_forecast_chunk,
+            "historical forecasts",
+        )
+
 
 def backfill_forecasts_from_archive() -> None:
     """
     Fallback: copy archive/reanalysis data into the forecasts table.
     Less ideal than real historical forecasts but gets training working.
     """
-    conn = db.get_conn()
-    count = conn.execute("""
-        INSERT OR REPLACE INTO forecasts
-            (fetched_at, valid_time, source, lead_hours,
-             temperature_2m, dewpoint_2m, relative_humidity_2m,
-             pressure_msl, surface_pressure,
-             wind_speed_10m, wind_direction_10m, wind_gusts_10m,
-             precipitation, precipitation_probability,
-             cloud_cover, cape, visibility)
-        SELECT
-            'backfill-archive', time, 'best_match', NULL,
-            temperature_2m, dewpoint_2m, relative_humidity_2m,
-            pressure_msl, surface_pressure,
-            wind_speed_10m, wind_direction_10m, NULL,
-            precipitation, NULL,
-            cloud_cover, NULL, NULL
-        FROM observations
-    """).rowcount
-    conn.commit()
-    conn.close()
-    print(f"[collector] Copied {count} observation rows → forecasts table (fallback)")
+    # The dedicated connection is closed, and its transaction committed or
+    # rolled back, before bulk_load_forecasts rebuilds the indexes
+    with db.bulk_load_forecasts(), closing(db.get_conn()) as conn, conn:
+        # One-shot bulk copy that can simply be re-run — skip the fsyncs
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("BEGIN IMMEDIATE")
+        # Upsert rather than INSERT OR REPLACE (delete + reinsert); rows whose
+        # values haven't changed since the last copy aren't rewritten at all.
+        # (An INSERT ... SELECT upsert needs a WHERE clause to parse.)
+        count = conn.execute("""
+            INSERT INTO forecasts
+                (fetched_at, valid_time, source, lead_hours,
+                 temperature_2m, dewpoint_2m, relative_humidity_2m,
+                 pressure_msl, surface_pressure,
+                 wind_speed_10m, wind_direction_10m, wind_gusts_10m,
+                 precipitation, precipitation_probability,
+                 cloud_cover, cape, visibility)
+            SELECT
+                'backfill-archive', time, 'best_match', NULL,
+                temperature_2m, dewpoint_2m, relative_humidity_2m,
+                pressure_msl, surface_pressure,
+                wind_speed_10m, wind_direction_10m, NULL,
+                precipitation, NULL,
+                cloud_cover, NULL, NULL
+            FROM observations
+            WHERE time IS NOT NULL
+            ON CONFLICT (fetched_at, valid_time, source) DO UPDATE SET
+                temperature_2m       = excluded.temperature_2m,
+                dewpoint_2m          = excluded.dewpoint_2m,
+                relative_humidity_2m = excluded.relative_humidity_2m,
+                pressure_msl         = excluded.pressure_msl,
+                surface_pressure     = excluded.surface_pressure,
+                wind_speed_10m       = excluded.wind_speed_10m,
+                wind_direction_10m   = excluded.wind_direction_10m,
+                precipitation        = excluded.precipitation,
+                cloud_cover          = excluded.cloud_cover
+            WHERE temperature_2m       IS NOT excluded.temperature_2m
+               OR dewpoint_2m          IS NOT excluded.dewpoint_2m
+               OR relative_humidity_2m IS NOT excluded.relative_humidity_2m
+               OR pressure_msl         IS NOT excluded.pressure_msl
+               OR surface_pressure     IS NOT excluded.surface_pressure
+               OR wind_speed_10m       IS NOT excluded.wind_speed_10m
+               OR wind_direction_10m   IS NOT excluded.wind_direction_10m
+               OR precipitation        IS NOT excluded.precipitation
+               OR cloud_cover          IS NOT excluded.cloud_cover
+        """).rowcount
+    print(f"[collector] Copied {count} new/changed observation rows → forecasts table (fallback)")
+
+
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+
+
+def _wait_for_request_slot() -> None:
+    """Space request starts BACKFILL_MIN_INTERVAL_S apart across all threads."""
+    global _next_request_at
+    with _rate_lock:
+        now = _time.monotonic()
+        wait = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + config.BACKFILL_MIN_INTERVAL_S
+    if wait > 0:
+        _time.sleep(wait)
 
 
 def _chunked_fetch(start, end, fetch_fn, store_fn, label, chunk_days=30):
-    """Fetch data in chunks to stay within API limits."""
+    """Fetch data in chunks to stay within API limits.
+
+    Chunks are fetched concurrently (rate-limited) and stored in order on
+    the calling thread, so SQLite only ever sees one writer.  At most
+    ``2 * BACKFILL_WORKERS`` chunks are in flight, and each is dropped once
+    stored, so only a handful of payloads are ever held in memory.
+    """
+    ranges = []
     chunk_start = start
     while chunk_start < end:
         chunk_end = min(chunk_start + timedelta(days=chunk_days), end)
-        s = chunk_start.strftime("%Y-%m-%d")
-        e = chunk_end.strftime("%Y-%m-%d")
-        print(f"[collector] Fetching {label} {s} → {e}")
-
-        try:
-            data = fetch_fn(s, e)
-            store_fn(data)
-        except requests.exceptions.HTTPError as exc:
-            print(f"[collector] ⚠ HTTP error for {s}→{e}: {exc}")
-            print(f"[collector]   Skipping chunk, continuing...")
-        except Exception as exc:
-            print(f"[collector] ⚠ Error for {s}→{e}: {exc}")
-            print(f"[collector]   Skipping chunk, continuing...")
-
+        ranges.append((chunk_start.strftime("%Y-%m-%d"), chunk_end.strftime("%Y-%m-%d")))
         chunk_start = chunk_end + timedelta(days=1)
-        _time.sleep(1.5)  # be polite to the free API
+
+    def fetch(s, e):
+        _wait_for_request_slot()
+        print(f"[collector] Fetching {label} {s} → {e}")
+        return fetch_fn(s, e)
+
+    todo = iter(ranges)
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=config.BACKFILL_WORKERS) as ex:
+        def submit(n):
+            for s, e in islice(todo, n):
+                pending.append((s, e, ex.submit(fetch, s, e)))
+
+        submit(2 * config.BACKFILL_WORKERS)
+        while pending:
+            s, e, future = pending.popleft()
+            submit(1)  # keep the window full while this chunk is stored
+            try:
+                store_fn(future.result())
+            except requests.exceptions.HTTPError as exc:
+                print(f"[collector] ⚠ HTTP error for {s}→{e}: {exc}")
+                print(f"[collector]   Skipping chunk, continuing...")
+            except Exception as exc:
+                print(f"[collector] ⚠ Error for {s}→{e}: {exc}")
+                print(f"[collector]   Skipping chunk, continuing...")
 
 
 # ═══════════════════════════════════════════════════════
@@ -235,10 +303,9 @@ def main() -> None:
         print("\n═══ Backfilling historical forecasts ═══")
         backfill_forecasts()
         # Verify
-        conn = db.get_conn()
-        obs = conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
-        fcst = conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0]
-        conn.close()
+        with db.checkout() as conn:
+            obs = conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+            fcst = conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0]
         print(f"\n✓ Observations: {obs}")
         print(f"✓ Forecasts:    {fcst}")
         return
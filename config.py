@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # ── Your location ──────────────────────────────────────
@@ -13,14 +14,24 @@ MODEL_DIR = BASE_DIR / "models"
 MODEL_DIR.mkdir(exist_ok=True)
 MODEL_PATH = MODEL_DIR / "weather_model.pkl"
 PRECIP_MODEL_PATH = MODEL_DIR / "precip_model.pkl"
+CHART_DIR = BASE_DIR / "static" / "charts"  # served by Flask at /static/charts/
+CHART_DIR.mkdir(parents=True, exist_ok=True)
 
 # ── Collection settings ───────────────────────────────
 FORECAST_DAYS = 7
 HISTORY_YEARS = 15  # how far back to seed on first run
+BACKFILL_WORKERS = 4  # concurrent Open-Meteo requests during backfill
+BACKFILL_MIN_INTERVAL_S = 0.5  # min spacing between request starts (free-tier limits)
 
 # ── Thresholds ─────────────────────────────────────────
 PRECIP_THRESHOLD_MM = 0.1  # minimum mm to count as "rain"
 
+# ── Inference ──────────────────────────────────────────
+# LightGBM threads per predict call.  Only predict.py and the background
+# refresh call predict (web workers never do), so use every core unless
+# PREDICT_THREADS in the environment says otherwise.
+PREDICT_THREADS = int(os.environ.get("PREDICT_THREADS", 0)) or (os.cpu_count() or 1)
+
 # ── Open-Meteo hourly variables ────────────────────────
 HOURLY_FORECAST_VARS = [
     "temperature_2m",
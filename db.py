@@ -1,4 +1,10 @@
+import os
 import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import numpy as np
 import pandas as pd
 from config import DB_PATH
 
@@ -6,69 +12,102 @@ from config import DB_PATH
 def get_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(DB_PATH)
     conn.execute("PRAGMA journal_mode=WAL")
+    # WAL + NORMAL only syncs at checkpoints; a crash can lose the last
+    # commit but never corrupts the database.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")        # 64 MB page cache
+    conn.execute("PRAGMA mmap_size=268435456")      # 256 MB memory-mapped reads
+    conn.execute("PRAGMA wal_autocheckpoint=1000")
     conn.execute("PRAGMA foreign_keys=ON")
     return conn
 
 
+# One long-lived connection per thread keeps SQLite's page cache warm across
+# calls.  Keyed by pid too: a connection must never be reused across fork().
+_local = threading.local()
+
+
+@contextmanager
+def checkout() -> Iterator[sqlite3.Connection]:
+    """Yield this thread's persistent connection, opening it on first use."""
+    pid = os.getpid()
+    if getattr(_local, "pid", None) != pid:
+        _local.conn = get_conn()
+        _local.pid = pid
+    yield _local.conn
+
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS forecasts (
+        fetched_at    TEXT    NOT NULL,
+        valid_time    TEXT    NOT NULL,
+        source        TEXT    NOT NULL,
+        lead_hours    INTEGER,
+        temperature_2m          REAL,
+        dewpoint_2m             REAL,
+        relative_humidity_2m    REAL,
+        pressure_msl            REAL,
+        surface_pressure        REAL,
+        wind_speed_10m          REAL,
+        wind_direction_10m      REAL,
+        wind_gusts_10m          REAL,
+        precipitation           REAL,
+        precipitation_probability REAL,
+        cloud_cover             REAL,
+        cape                    REAL,
+        visibility              REAL,
+        PRIMARY KEY (fetched_at, valid_time, source)
+    );
+
+    CREATE TABLE IF NOT EXISTS observations (
+        time              TEXT PRIMARY KEY,
+        temperature_2m    REAL,
+        dewpoint_2m       REAL,
+        relative_humidity_2m REAL,
+        pressure_msl      REAL,
+        surface_pressure   REAL,
+        wind_speed_10m    REAL,
+        wind_direction_10m REAL,
+        precipitation     REAL,
+        cloud_cover       REAL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_fcst_valid
+        ON forecasts(valid_time);
+    -- Latest-run lookup in load_paired_data: each (source, valid_time)
+    -- partition is read already ordered by fetched_at, so the window
+    -- function needs no sort.  Supersedes idx_fcst_source (its prefix).
+    CREATE INDEX IF NOT EXISTS idx_fcst_latest
+        ON forecasts(source, valid_time, fetched_at DESC);
+    DROP INDEX IF EXISTS idx_fcst_source;
+"""
+
+
 def init_db() -> None:
-    conn = get_conn()
-    conn.executescript("""
-        CREATE TABLE IF NOT EXISTS forecasts (
-            fetched_at    TEXT    NOT NULL,
-            valid_time    TEXT    NOT NULL,
-            source        TEXT    NOT NULL,
-            lead_hours    INTEGER,
-            temperature_2m          REAL,
-            dewpoint_2m             REAL,
-            relative_humidity_2m    REAL,
-            pressure_msl            REAL,
-            surface_pressure        REAL,
-            wind_speed_10m          REAL,
-            wind_direction_10m      REAL,
-            wind_gusts_10m          REAL,
-            precipitation           REAL,
-            precipitation_probability REAL,
-            cloud_cover             REAL,
-            cape                    REAL,
-            visibility              REAL,
-            PRIMARY KEY (fetched_at, valid_time, source)
-        );
-
-        CREATE TABLE IF NOT EXISTS observations (
-            time              TEXT PRIMARY KEY,
-            temperature_2m    REAL,
-            dewpoint_2m       REAL,
-            relative_humidity_2m REAL,
-            pressure_msl      REAL,
-            surface_pressure   REAL,
-            wind_speed_10m    REAL,
-            wind_direction_10m REAL,
-            precipitation     REAL,
-            cloud_cover       REAL
-        );
-
-        CREATE INDEX IF NOT EXISTS idx_fcst_valid
-            ON forecasts(valid_time);
-        CREATE INDEX IF NOT EXISTS idx_fcst_source
-            ON forecasts(source, valid_time);
-    """)
-    conn.commit()
-    conn.close()
+    with checkout() as conn, conn:
+        conn.executescript(SCHEMA)
+
+
+@contextmanager
+def bulk_load_forecasts() -> Iterator[None]:
+    """Drop the secondary forecast indexes for a bulk load, rebuild them after.
+
+    One sorted index build at the end is far cheaper than a B-tree update
+    per inserted row.  The primary key stays, so upserts still work.
+    """
+    with checkout() as conn:
+        conn.execute("DROP INDEX IF EXISTS idx_fcst_valid")
+        conn.execute("DROP INDEX IF EXISTS idx_fcst_latest")
+    try:
+        yield
+    finally:
+        init_db()  # recreates them (CREATE INDEX IF NOT EXISTS)
 
 
 def insert_forecasts(rows: list[dict], source: str, fetched_at: str) -> None:
-    conn = get_conn()
-    for row in rows:
-        conn.execute("""
-            INSERT OR REPLACE INTO forecasts
-            (fetched_at, valid_time, source, lead_hours,
-             temperature_2m, dewpoint_2m, relative_humidity_2m,
-             pressure_msl, surface_pressure,
-             wind_speed_10m, wind_direction_10m, wind_gusts_10m,
-             precipitation, precipitation_probability,
-             cloud_cover, cape, visibility)
-            VALUES (?,?,?,?, ?,?,?, ?,?, ?,?,?, ?,?, ?,?,?)
-        """, (
+    params = [
+        (
             fetched_at, row["time"], source, row.get("lead_hours"),
             row.get("temperature_2m"),
             row.get("dewpoint_2m"),
@@ -83,22 +122,57 @@ def insert_forecasts(rows: list[dict], source: str, fetched_at: str) -> None:
             row.get("cloud_cover"),
             row.get("cape"),
             row.get("visibility"),
-        ))
-    conn.commit()
-    conn.close()
+        )
+        for row in rows
+    ]
+    # One prepared statement, one transaction → one commit for the batch.
+    # Upsert rather than INSERT OR REPLACE (delete + reinsert): re-fetched
+    # rows that haven't changed don't dirty any table or index pages.
+    with checkout() as conn, conn:
+        conn.executemany("""
+            INSERT INTO forecasts
+            (fetched_at, valid_time, source, lead_hours,
+             temperature_2m, dewpoint_2m, relative_humidity_2m,
+             pressure_msl, surface_pressure,
+             wind_speed_10m, wind_direction_10m, wind_gusts_10m,
+             precipitation, precipitation_probability,
+             cloud_cover, cape, visibility)
+            VALUES (?,?,?,?, ?,?,?, ?,?, ?,?,?, ?,?, ?,?,?)
+            ON CONFLICT (fetched_at, valid_time, source) DO UPDATE SET
+                lead_hours                = excluded.lead_hours,
+                temperature_2m            = excluded.temperature_2m,
+                dewpoint_2m               = excluded.dewpoint_2m,
+                relative_humidity_2m      = excluded.relative_humidity_2m,
+                pressure_msl              = excluded.pressure_msl,
+                surface_pressure          = excluded.surface_pressure,
+                wind_speed_10m            = excluded.wind_speed_10m,
+                wind_direction_10m        = excluded.wind_direction_10m,
+                wind_gusts_10m            = excluded.wind_gusts_10m,
+                precipitation             = excluded.precipitation,
+                precipitation_probability = excluded.precipitation_probability,
+                cloud_cover               = excluded.cloud_cover,
+                cape                      = excluded.cape,
+                visibility                = excluded.visibility
+            WHERE lead_hours                IS NOT excluded.lead_hours
+               OR temperature_2m            IS NOT excluded.temperature_2m
+               OR dewpoint_2m               IS NOT excluded.dewpoint_2m
+               OR relative_humidity_2m      IS NOT excluded.relative_humidity_2m
+               OR pressure_msl              IS NOT excluded.pressure_msl
+               OR surface_pressure          IS NOT excluded.surface_pressure
+               OR wind_speed_10m            IS NOT excluded.wind_speed_10m
+               OR wind_direction_10m        IS NOT excluded.wind_direction_10m
+               OR wind_gusts_10m            IS NOT excluded.wind_gusts_10m
+               OR precipitation             IS NOT excluded.precipitation
+               OR precipitation_probability IS NOT excluded.precipitation_probability
+               OR cloud_cover               IS NOT excluded.cloud_cover
+               OR cape                      IS NOT excluded.cape
+               OR visibility                IS NOT excluded.visibility
+        """, params)
 
 
 def insert_observations(rows: list[dict]) -> None:
-    conn = get_conn()
-    for row in rows:
-        conn.execute("""
-            INSERT OR REPLACE INTO observations
-            (time, temperature_2m, dewpoint_2m, relative_humidity_2m,
-             pressure_msl, surface_pressure,
-             wind_speed_10m, wind_direction_10m,
-             precipitation, cloud_cover)
-            VALUES (?,?,?,?, ?,?, ?,?, ?,?)
-        """, (
+    params = [
+        (
             row["time"],
             row.get("temperature_2m"),
             row.get("dewpoint_2m"),
@@ -109,13 +183,40 @@ def insert_observations(rows: list[dict]) -> None:
             row.get("wind_direction_10m"),
             row.get("precipitation"),
             row.get("cloud_cover"),
-        ))
-    conn.commit()
-    conn.close()
+        )
+        for row in rows
+    ]
+    with checkout() as conn, conn:
+        conn.executemany("""
+            INSERT INTO observations
+            (time, temperature_2m, dewpoint_2m, relative_humidity_2m,
+             pressure_msl, surface_pressure,
+             wind_speed_10m, wind_direction_10m,
+             precipitation, cloud_cover)
+            VALUES (?,?,?,?, ?,?, ?,?, ?,?)
+            ON CONFLICT (time) DO UPDATE SET
+                temperature_2m       = excluded.temperature_2m,
+                dewpoint_2m          = excluded.dewpoint_2m,
+                relative_humidity_2m = excluded.relative_humidity_2m,
+                pressure_msl         = excluded.pressure_msl,
+                surface_pressure     = excluded.surface_pressure,
+                wind_speed_10m       = excluded.wind_speed_10m,
+                wind_direction_10m   = excluded.wind_direction_10m,
+                precipitation        = excluded.precipitation,
+                cloud_cover          = excluded.cloud_cover
+            WHERE temperature_2m       IS NOT excluded.temperature_2m
+               OR dewpoint_2m          IS NOT excluded.dewpoint_2m
+               OR relative_humidity_2m IS NOT excluded.relative_humidity_2m
+               OR pressure_msl         IS NOT excluded.pressure_msl
+               OR surface_pressure     IS NOT excluded.surface_pressure
+               OR wind_speed_10m       IS NOT excluded.wind_speed_10m
+               OR wind_direction_10m   IS NOT excluded.wind_direction_10m
+               OR precipitation        IS NOT excluded.precipitation
+               OR cloud_cover          IS NOT excluded.cloud_cover
+        """, params)
 
 
 def load_observations(start: str | None = None, end: str | None = None) -> pd.DataFrame:
-    conn = get_conn()
     query = "SELECT * FROM observations"
     conditions = []
     params = []
@@ -128,16 +229,15 @@ def load_observations(start: str | None = None, end: str | None = None) -> pd.Da
     if conditions:
         query += " WHERE " + " AND ".join(conditions)
     query += " ORDER BY time"
-    df = pd.read_sql(query, conn, params=params, parse_dates=["time"])
+    with checkout() as conn:
+        df = pd.read_sql(query, conn, params=params, parse_dates=["time"])
     df.set_index("time", inplace=True)
-    conn.close()
     return df
 
 
 def load_forecasts(source: str = "best_match",
                    start: str | None = None,
                    end: str | None = None) -> pd.DataFrame:
-    conn = get_conn()
     query = "SELECT * FROM forecasts WHERE source = ?"
     params: list = [source]
     if start:
@@ -147,14 +247,13 @@ def load_forecasts(source: str = "best_match",
         query += " AND valid_time <= ?"
         params.append(end)
     query += " ORDER BY valid_time, fetched_at"
-    df = pd.read_sql(query, conn, params=params, parse_dates=["valid_time", "fetched_at"])
-    conn.close()
+    with checkout() as conn:
+        df = pd.read_sql(query, conn, params=params, parse_dates=["valid_time", "fetched_at"])
     return df
 
 
 def load_paired_data() -> pd.DataFrame:
     """Join most-recent forecast per valid_time with observations."""
-    conn = get_conn()
     query = """
         WITH latest_fcst AS (
             SELECT *,
@@ -196,15 +295,32 @@ def load_paired_data() -> pd.DataFrame:
             ON f.valid_time = o.time AND f.rn = 1
         ORDER BY o.time
     """
-    df = pd.read_sql(query, conn, parse_dates=["time"])
-    df.set_index("time", inplace=True)
-    conn.close()
+    with checkout() as conn:
+        columns = fetch_columns(conn, query, converters={"time": pd.to_datetime})
+    index = pd.DatetimeIndex(columns.pop("time"), name="time")
+    return pd.DataFrame(columns, index=index)
+
+
+def fetch_columns(conn: sqlite3.Connection, sql: str, params: tuple = (),
+                 converters: dict | None = None) -> dict[str, np.ndarray]:
+    """Run ``sql`` and return ``{column: array}``, converting each column once.
+
+    Columns default to float64 with NULL → NaN; ``converters`` overrides that
+    per column.  SQLite's dynamic typing means read_sql would hand back
+    'object' columns wherever NULLs mix with numbers, needing a to_numeric
+    pass on top — building typed arrays straight from the tuples skips both.
+    """
+    cur = conn.execute(sql, params)
+    names = [d[0] for d in cur.description]
+    rows = cur.fetchall()
+    columns = zip(*rows) if rows else [()] * len(names)
+    converters = converters or {}
+    return {name: converters.get(name, _to_float)(col) for name, col in zip(names, columns)}
 
-    # ── Force all feature/target columns to numeric ──────────
-    # SQLite stores everything as TEXT internally; when columns
-    # contain NULLs mixed with numbers, pandas infers 'object'.
-    numeric_cols = [c for c in df.columns if c != "time"]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
 
-    return df
\ No newline at end of file
+def _to_float(values) -> np.ndarray:
+    """float64 array from a result column — NULL and non-numeric text become NaN."""
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
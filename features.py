@@ -3,94 +3,168 @@ import numpy as np
 import pandas as pd
 
 
-def add_temporal_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Cyclical time encodings from the DatetimeIndex."""
-    hour = df.index.hour
-    doy = df.index.dayofyear
+def _with_columns(df: pd.DataFrame, cols: dict) -> pd.DataFrame:
+    """Append ``cols`` to ``df`` as one block rather than one insert per column."""
+    new = pd.DataFrame(cols, index=df.index, copy=False)
+    return pd.concat([df.drop(columns=new.columns, errors="ignore"), new], axis=1)
+
+
+# Raw input columns the feature steps read — extracted once per build
+SOURCE_COLUMNS = [
+    "fcst_temp", "fcst_dewpoint", "fcst_humidity", "fcst_pressure",
+    "fcst_wind_speed", "fcst_wind_dir", "fcst_wind_gust", "fcst_precip",
+    "obs_temp", "obs_precip",
+]
+
+
+def _source_arrays(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Contiguous float64 copies of the SOURCE_COLUMNS present in ``df``."""
+    return {
+        col: np.ascontiguousarray(df[col].to_numpy(dtype=np.float64))
+        for col in SOURCE_COLUMNS if col in df.columns
+    }
+
+
+def _row_block(src: dict[str, np.ndarray], names: list[str]) -> np.ndarray:
+    """(len(names), N) float64 block — one contiguous row per array."""
+    return np.vstack([src[name] for name in names])
+
 
-    df["hour_sin"] = np.sin(2 * np.pi * hour / 24)
-    df["hour_cos"] = np.cos(2 * np.pi * hour / 24)
-    df["doy_sin"] = np.sin(2 * np.pi * doy / 365.25)
-    df["doy_cos"] = np.cos(2 * np.pi * doy / 365.25)
-    df["month"] = df.index.month
-    return df
+def _lagged_diff(block: np.ndarray, window: int) -> np.ndarray:
+    """``x[t] - x[t - window]`` along each row; NaN for the first ``window`` steps."""
+    out = np.full_like(block, np.nan)
+    out[..., window:] = block[..., window:] - block[..., :-window]
+    return out
 
 
-def add_derived_meteo(df: pd.DataFrame) -> pd.DataFrame:
+def _shifted(values: np.ndarray, lag: int) -> np.ndarray:
+    """``values`` delayed by ``lag`` steps, NaN-padded (``Series.shift``)."""
+    out = np.full_like(values, np.nan)
+    out[lag:] = values[:-lag]
+    return out
+
+
+def temporal_features(index: pd.DatetimeIndex) -> dict[str, np.ndarray]:
+    """Cyclical time encodings from the DatetimeIndex."""
+    # Same operation order as 2 * pi * x / period: folding the constant into
+    # one factor changes the last bit, which moves LightGBM's bin edges
+    hour = 2 * np.pi * index.hour.to_numpy(dtype=np.float64) / 24
+    doy = 2 * np.pi * index.dayofyear.to_numpy(dtype=np.float64) / 365.25
+
+    # Both angles in one (N, 2) block → one sin pass and one cos pass
+    angles = np.column_stack([hour, doy])
+    sin, cos = np.sin(angles), np.cos(angles)
+    return {
+        "hour_sin": sin[:, 0],
+        "hour_cos": cos[:, 0],
+        "doy_sin": sin[:, 1],
+        "doy_cos": cos[:, 1],
+        "month": index.month.to_numpy(),
+    }
+
+
+def derived_meteo(src: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
     """Meteorologically meaningful derived features."""
+    cols = {}
+
     # Dewpoint depression — key rain predictor
-    df["dewpoint_depression"] = df["fcst_temp"] - df["fcst_dewpoint"]
+    cols["dewpoint_depression"] = src["fcst_temp"] - src["fcst_dewpoint"]
+
+    speed = src["fcst_wind_speed"]
+    gust = src["fcst_wind_gust"]
 
     # Wind components (better than speed + direction for ML)
-    wind_rad = np.radians(df["fcst_wind_dir"])
-    df["wind_u"] = -df["fcst_wind_speed"] * np.sin(wind_rad)
-    df["wind_v"] = -df["fcst_wind_speed"] * np.cos(wind_rad)
+    wind_rad = src["fcst_wind_dir"] * (np.pi / 180)
+    cols["wind_u"] = -speed * np.sin(wind_rad)
+    cols["wind_v"] = -speed * np.cos(wind_rad)
+
+    # Gust ratio — 1.0 where calm or either value is missing
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gust_ratio = gust / speed
+    gust_ratio[(speed == 0) | np.isnan(gust_ratio)] = 1.0
+    cols["gust_ratio"] = gust_ratio
 
-    # Gust ratio
-    df["gust_ratio"] = df["fcst_wind_gust"] / df["fcst_wind_speed"].replace(0, np.nan)
-    df["gust_ratio"] = df["gust_ratio"].fillna(1.0)
+    return cols
 
-    return df
 
+def tendency_features(src: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Pressure / temperature / humidity tendencies (change over N hours).
 
-def add_tendency_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Pressure / temperature / humidity tendencies (change over N hours)."""
-    for var, col in [
-        ("pressure", "fcst_pressure"),
-        ("temp", "fcst_temp"),
-        ("humidity", "fcst_humidity"),
-    ]:
-        for window in [3, 6, 12, 24]:
-            df[f"{var}_tend_{window}h"] = df[col] - df[col].shift(window)
+    ``src`` must already hold the wind components from derived_meteo.
+    """
+    cols = {}
+    names = ["pressure", "temp", "humidity"]
+    windows = [3, 6, 12, 24]
+    block = _row_block(src, ["fcst_pressure", "fcst_temp", "fcst_humidity"])
+    diffs = {window: _lagged_diff(block, window) for window in windows}
+    for i, var in enumerate(names):
+        for window in windows:
+            cols[f"{var}_tend_{window}h"] = diffs[window][i]
 
     # Wind component shifts (frontal passage signal)
-    for comp in ["wind_u", "wind_v"]:
+    wind = _row_block(src, ["wind_u", "wind_v"])
+    diffs = {window: _lagged_diff(wind, window) for window in [3, 6]}
+    for i, comp in enumerate(["wind_u", "wind_v"]):
         for window in [3, 6]:
-            df[f"{comp}_change_{window}h"] = df[comp] - df[comp].shift(window)
+            cols[f"{comp}_change_{window}h"] = diffs[window][i]
 
-    return df
+    return cols
 
 
-def add_lag_features(df: pd.DataFrame) -> pd.DataFrame:
+def lag_features(src: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
     """Recent observed conditions as features."""
+    cols = {}
     for lag in [1, 2, 3, 6, 12, 24]:
-        df[f"obs_precip_lag_{lag}h"] = df["obs_precip"].shift(lag)
-        df[f"obs_temp_lag_{lag}h"] = df["obs_temp"].shift(lag)
+        cols[f"obs_precip_lag_{lag}h"] = _shifted(src["obs_precip"], lag)
+        cols[f"obs_temp_lag_{lag}h"] = _shifted(src["obs_temp"], lag)
 
-    # Rolling precipitation sums
+    # Rolling precipitation sums — pandas' rolling kernels are already
+    # single-pass O(N); sum and max share one window object
+    precip = pd.Series(src["obs_precip"], copy=False)
     for window in [6, 12, 24]:
-        df[f"obs_precip_roll_{window}h_sum"] = (
-            df["obs_precip"].rolling(window, min_periods=1).sum()
-        )
-        df[f"obs_precip_roll_{window}h_max"] = (
-            df["obs_precip"].rolling(window, min_periods=1).max()
-        )
+        rolling = precip.rolling(window, min_periods=1)
+        cols[f"obs_precip_roll_{window}h_sum"] = rolling.sum().to_numpy()
+        cols[f"obs_precip_roll_{window}h_max"] = rolling.max().to_numpy()
 
-    return df
+    return cols
 
 
-def add_nwp_bias_features(df: pd.DataFrame) -> pd.DataFrame:
+def nwp_bias_features(src: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
     """Running NWP bias — how wrong has the model been recently?"""
-    if "obs_temp" in df.columns and "fcst_temp" in df.columns:
-        temp_error = df["obs_temp"] - df["fcst_temp"]
-        df["nwp_temp_bias_24h"] = temp_error.rolling(24, min_periods=1).mean()
-        df["nwp_temp_bias_72h"] = temp_error.rolling(72, min_periods=1).mean()
+    errors = {}
+    if "obs_temp" in src and "fcst_temp" in src:
+        errors["temp"] = src["obs_temp"] - src["fcst_temp"]
+    if "obs_precip" in src and "fcst_precip" in src:
+        errors["precip"] = src["obs_precip"] - src["fcst_precip"]
 
-    if "obs_precip" in df.columns and "fcst_precip" in df.columns:
-        precip_error = df["obs_precip"] - df["fcst_precip"]
-        df["nwp_precip_bias_24h"] = precip_error.rolling(24, min_periods=1).mean()
+    # Both 24h biases come out of one two-column rolling pass
+    errors = pd.DataFrame(errors)
+    bias_24h = errors.rolling(24, min_periods=1).mean()
 
-    return df
+    cols = {}
+    if "temp" in errors.columns:
+        cols["nwp_temp_bias_24h"] = bias_24h["temp"].to_numpy()
+        cols["nwp_temp_bias_72h"] = errors["temp"].rolling(72, min_periods=1).mean().to_numpy()
+    if "precip" in errors.columns:
+        cols["nwp_precip_bias_24h"] = bias_24h["precip"].to_numpy()
+
+    return cols
 
 
 def build_feature_set(df: pd.DataFrame) -> pd.DataFrame:
-    """Apply all feature engineering steps in order."""
-    df = add_temporal_features(df)
-    df = add_derived_meteo(df)
-    df = add_tendency_features(df)
-    df = add_lag_features(df)
-    df = add_nwp_bias_features(df)
-    return df
+    """Apply all feature engineering steps in order.
+
+    The source columns are pulled out of ``df`` once; every step works on
+    plain arrays and the results are written back in a single block.
+    """
+    src = _source_arrays(df)
+    cols = temporal_features(df.index)
+    derived = derived_meteo(src)
+    cols.update(derived)
+    cols.update(tendency_features({**src, **derived}))
+    cols.update(lag_features(src))
+    cols.update(nwp_bias_features(src))
+    return _with_columns(df, cols)
 
 
 def get_feature_columns(df: pd.DataFrame) -> list[str]:
@@ -102,14 +176,14 @@ def get_feature_columns(df: pd.DataFrame) -> list[str]:
     include_even_if_obs = {c for c in df.columns if "lag_" in c or "roll_" in c or "bias_" in c}
 
     feature_cols = []
-    for col in df.columns:
+    for col, dtype in df.dtypes.items():
         if col in include_even_if_obs:
             feature_cols.append(col)
         elif any(col.startswith(p) for p in exclude_prefixes):
             continue
         elif col in exclude_exact:
             continue
-        elif df[col].dtype in (np.float64, np.float32, np.int64, np.int32, float, int):
+        elif dtype in (np.float64, np.float32, np.int64, np.int32, float, int):
             feature_cols.append(col)
 
     # Also include lead_hours — it's critical
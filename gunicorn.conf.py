@@ -1,4 +1,5 @@
 import multiprocessing
+import sys
 
 # Render free tier has limited RAM — keep it lean
 workers = 2
@@ -8,4 +9,21 @@ timeout = 120            # chart generation can take a moment
 accesslog = "-"          # log to stdout
 errorlog = "-"
 loglevel = "info"
-preload_app = False      # let each worker init independently
+# Import the app once in the master and fork the workers from it: startup
+# runs once instead of once per worker, and the pandas/LightGBM/matplotlib
+# imports are shared copy-on-write.  SQLite connections are opened per
+# process (db.checkout is keyed by pid).
+preload_app = True
+
+
+def post_worker_init(worker):
+    """Start the background refresh in the worker, not the master.
+
+    A LightGBM crash then takes down one worker, and the master holds no
+    threads or locks mid-refresh for later forks to inherit.  Every worker
+    starts the thread; a file lock lets only one of them refresh.  Only for
+    the Render entry point (wsgi:app) — not for ``python serve.py``.
+    """
+    if "wsgi" in sys.modules:
+        from background import start_background_thread
+        start_background_thread()
@@ -0,0 +1,46 @@
+"""
+JSON encoding/decoding shared by the forecast writers and the server.
+Uses orjson (a declared dependency); the stdlib json path is a fallback.
+"""
+import json
+
+try:
+    # C codec — parses from / encodes to bytes several times faster than json
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: bytes | str):
+    """Parse a JSON document from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, *, indent: bool = False, sort_keys: bool = False,
+          newline: bool = False) -> bytes:
+    """``obj`` as UTF-8 JSON bytes; compact unless ``indent`` (2 spaces).
+
+    Both paths emit non-ASCII text as raw UTF-8.  They still differ on
+    non-finite floats: orjson writes NaN/Infinity as null, json as NaN.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+
+    text = json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys,
+                      indent=2 if indent else None,
+                      separators=None if indent else (",", ":"))
+    return (text + "\n" if newline else text).encode("utf-8")
+
+
+def write_json(path, obj, *, indent: bool = False) -> None:
+    """Write ``obj`` to ``path`` in one call (see ``dumps``)."""
+    path.write_bytes(dumps(obj, indent=indent))
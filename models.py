@@ -1,11 +1,13 @@
 """Model definitions for weather prediction."""
+import os
+
 import numpy as np
 import pandas as pd
 import lightgbm as lgb
 from sklearn.isotonic import IsotonicRegression
 import joblib
 
-from config import PRECIP_THRESHOLD_MM
+from config import PRECIP_THRESHOLD_MM, PREDICT_THREADS
 
 
 # ── Shared LightGBM base parameters ──────────────────
@@ -24,12 +26,44 @@ BASE_PARAMS = {
 }
 
 
+def _fit_quantiles(X: pd.DataFrame, y: pd.Series,
+                   alphas: list[float]) -> dict[float, lgb.LGBMRegressor]:
+    """Fit one quantile model per alpha, concurrently.
+
+    Threads rather than processes: LightGBM releases the GIL while training
+    and X isn't copied per worker.  Each fit gets its share of the cores
+    instead of every sequential fit claiming all of them.
+    """
+    cores = os.cpu_count() or 1
+    n_parallel = min(len(alphas), cores)
+    threads = max(1, cores // n_parallel)
+
+    def fit(alpha: float) -> tuple[float, lgb.LGBMRegressor]:
+        qparams = {**BASE_PARAMS, "objective": "quantile", "alpha": alpha,
+                   "n_estimators": 500, "num_leaves": 31, "n_jobs": threads}
+        return alpha, lgb.LGBMRegressor(**qparams).fit(X, y)
+
+    return dict(joblib.Parallel(n_jobs=n_parallel, backend="threading")(
+        joblib.delayed(fit)(alpha) for alpha in alphas
+    ))
+
+
+def _booster_predict(model: lgb.LGBMModel, X: np.ndarray) -> np.ndarray:
+    """Predict through the fitted Booster on an already-converted array.
+
+    The sklearn wrapper re-validates and re-converts the frame on every
+    call; for a binary classifier this returns the positive-class probability.
+    """
+    return model.booster_.predict(X, num_threads=PREDICT_THREADS)
+
+
 class WeatherPredictor:
     """Multi-output MOS corrector for temperature, humidity, wind."""
 
     def __init__(self):
         self.models: dict[str, lgb.LGBMRegressor] = {}
         self.quantile_models: dict[str, dict[float, lgb.LGBMRegressor]] = {}
+        self.feature_names: list[str] = []
         self.targets = {
             "temperature": {"objective": "regression", "metric": "mae"},
             "humidity": {"objective": "regression", "metric": "mae"},
@@ -50,6 +84,7 @@ class WeatherPredictor:
         X_val: pd.DataFrame,
         y_val: pd.DataFrame,
     ) -> dict[str, float]:
+        self.feature_names = list(X_train.columns)
         scores = {}
         for target, info in self.targets.items():
             obs_col = self.target_to_obs_col[target]
@@ -82,23 +117,22 @@ class WeatherPredictor:
             print(f"  {target}: val MAE = {mae:.3f}")
 
             # Quantile models for prediction intervals
-            self.quantile_models[target] = {}
-            for alpha in [0.1, 0.9]:
-                qparams = {**BASE_PARAMS, "objective": "quantile", "alpha": alpha,
-                           "n_estimators": 500, "num_leaves": 31}
-                qmodel = lgb.LGBMRegressor(**qparams)
-                qmodel.fit(X_train.loc[common], yt.loc[common])
-                self.quantile_models[target][alpha] = qmodel
+            self.quantile_models[target] = _fit_quantiles(
+                X_train.loc[common], yt.loc[common], [0.1, 0.9]
+            )
 
         return scores
 
     def predict(self, X: pd.DataFrame) -> dict[str, np.ndarray]:
+        # One conversion shared by every booster (columns in training order)
+        X = np.asarray(X, dtype=np.float64)
         results = {}
         for target, model in self.models.items():
-            results[target] = model.predict(X)
+            results[target] = _booster_predict(model, X)
             if target in self.quantile_models:
-                results[f"{target}_q10"] = self.quantile_models[target][0.1].predict(X)
-                results[f"{target}_q90"] = self.quantile_models[target][0.9].predict(X)
+                quantiles = self.quantile_models[target]
+                results[f"{target}_q10"] = _booster_predict(quantiles[0.1], X)
+                results[f"{target}_q90"] = _booster_predict(quantiles[0.9], X)
 
         # Physical constraints
         if "humidity" in results:
@@ -108,12 +142,17 @@ class WeatherPredictor:
         return results
 
     def save(self, path) -> None:
-        joblib.dump({"models": self.models, "quantile_models": self.quantile_models}, path)
+        joblib.dump({"models": self.models, "quantile_models": self.quantile_models,
+                     "feature_names": self.feature_names}, path)
 
     def load(self, path) -> None:
         data = joblib.load(path)
         self.models = data["models"]
         self.quantile_models = data.get("quantile_models", {})
+        # Files saved before feature_names was stored: take it from a booster
+        self.feature_names = data.get("feature_names") or list(
+            next(iter(self.models.values())).feature_name_
+        )
 
 
 class PrecipitationPredictor:
@@ -167,27 +206,35 @@ class PrecipitationPredictor:
             )
 
             # Quantile models for uncertainty
-            for alpha in [0.1, 0.25, 0.5, 0.75, 0.9]:
-                qparams = {**BASE_PARAMS, "objective": "quantile", "alpha": alpha,
-                           "n_estimators": 500, "num_leaves": 31}
-                qmodel = lgb.LGBMRegressor(**qparams)
-                qmodel.fit(X_train[rain_mask_train], y_train_precip[rain_mask_train])
-                self.quantile_models[alpha] = qmodel
+            self.quantile_models = _fit_quantiles(
+                X_train[rain_mask_train], y_train_precip[rain_mask_train],
+                [0.1, 0.25, 0.5, 0.75, 0.9],
+            )
 
         # Scores
         from sklearn.metrics import brier_score_loss, roc_auc_score
 
-        cal_probs = self.calibrator.predict(raw_probs)
+        cal_probs = self._calibrate(raw_probs)
         scores["brier"] = brier_score_loss(y_binary_val, cal_probs)
         scores["auc"] = roc_auc_score(y_binary_val, cal_probs)
         print(f"  Precip classification: Brier={scores['brier']:.4f}, AUC={scores['auc']:.4f}")
         return scores
 
+    def _calibrate(self, raw_probs: np.ndarray) -> np.ndarray:
+        """Isotonic calibration as a plain np.interp over the fitted knots.
+
+        Same result as ``self.calibrator.predict`` (linear between knots,
+        clipped at the ends) without sklearn's per-call validation overhead.
+        """
+        cal = self.calibrator
+        return np.interp(raw_probs, cal.X_thresholds_, cal.y_thresholds_)
+
     def predict(self, X: pd.DataFrame) -> dict[str, np.ndarray]:
-        raw_probs = self.classifier.predict_proba(X)[:, 1]
-        prob = self.calibrator.predict(raw_probs) if self.calibrator else raw_probs
+        X = np.asarray(X, dtype=np.float64)
+        raw_probs = _booster_predict(self.classifier, X)
+        prob = self._calibrate(raw_probs) if self.calibrator else raw_probs
 
-        raw_amount = self.regressor.predict(X)
+        raw_amount = _booster_predict(self.regressor, X)
         raw_amount = np.maximum(raw_amount, 0)
 
         results = {
@@ -197,7 +244,7 @@ class PrecipitationPredictor:
         }
 
         for alpha, qmodel in self.quantile_models.items():
-            q = np.maximum(qmodel.predict(X), 0)
+            q = np.maximum(_booster_predict(qmodel, X), 0)
             results[f"precip_q{int(alpha*100):02d}_mm"] = q * prob
 
         return results
@@ -2,7 +2,7 @@
 Generate predictions from the latest NWP data.
 Run via cron every 6 hours:  0 */6 * * *  uv run python predict.py
 """
-import json
+import threading
 from datetime import datetime, timezone
 
 import numpy as np
@@ -10,8 +10,10 @@ import pandas as pd
 import requests
 
 import config
-from features import build_feature_set, get_feature_columns
+from features import build_feature_set
+from jsonio import write_json
 from models import WeatherPredictor, PrecipitationPredictor
+from summaries import daily_summaries
 
 
 def fetch_current_forecast() -> pd.DataFrame:
@@ -69,81 +71,103 @@ def fetch_current_forecast() -> pd.DataFrame:
     return df
 
 
-def main() -> None:
-    print(f"[predict] Loading models...")
-    wp = WeatherPredictor()
-    wp.load(config.MODEL_PATH)
+# Models stay loaded between runs of the long-lived refresh thread and
+# are only re-read when train.py rewrites the files.
+_models_lock = threading.Lock()
+_models: tuple[WeatherPredictor, PrecipitationPredictor] | None = None
+_models_stamp: tuple[int, int] | None = None
+
+
+def load_models() -> tuple[WeatherPredictor, PrecipitationPredictor]:
+    """Return the (weather, precipitation) predictors, loading them if needed."""
+    global _models, _models_stamp
+    stamp = (config.MODEL_PATH.stat().st_mtime_ns,
+             config.PRECIP_MODEL_PATH.stat().st_mtime_ns)
+    with _models_lock:
+        if _models is None or stamp != _models_stamp:
+            print(f"[predict] Loading models...")
+            wp = WeatherPredictor()
+            wp.load(config.MODEL_PATH)
+
+            pp = PrecipitationPredictor()
+            pp.load(config.PRECIP_MODEL_PATH)
+            _models, _models_stamp = (wp, pp), stamp
+        return _models
 
-    pp = PrecipitationPredictor()
-    pp.load(config.PRECIP_MODEL_PATH)
+
+def main() -> None:
+    wp, pp = load_models()
 
     print(f"[predict] Fetching latest forecast...")
     df = fetch_current_forecast()
     df = build_feature_set(df)
 
-    feature_cols = get_feature_columns(df)
-    # Only use features that the model was trained on
-    trained_features = wp.models["temperature"].feature_name_
-    available = [c for c in trained_features if c in df.columns]
+    # Only use features that the model was trained on — the list is stored
+    # with the model, so there's no need to re-derive it from the frame
+    trained_features = wp.feature_names
     missing = [c for c in trained_features if c not in df.columns]
     if missing:
         print(f"  ⚠ Missing {len(missing)} features, filling with 0: {missing[:5]}...")
         for col in missing:
             df[col] = 0
-    X = df[trained_features]
+    # Convert once for both predictors, in training column order.  Kept at
+    # float64: a float32 cast moves values across the trees' split thresholds.
+    X = df[trained_features].to_numpy(dtype=np.float64)
 
     weather = wp.predict(X)
     precip = pp.predict(X)
 
     # ── Build output ──
-    forecast_rows = []
-    for i, t in enumerate(df.index):
-        row = {
-            "time": t.isoformat(),
-            "lead_hours": int(df["lead_hours"].iloc[i]),
-            "temperature_c": round(float(weather["temperature"][i]), 1),
-            "humidity_pct": round(float(weather["humidity"][i]), 0),
-            "wind_speed_kmh": round(float(weather["wind_speed"][i]), 1),
-            "precip_probability_pct": round(float(precip["precip_probability"][i]) * 100, 0),
-            "precip_expected_mm": round(float(precip["precip_expected_mm"][i]), 2),
-        }
-        if "temperature_q10" in weather:
-            row["temperature_range_c"] = [
-                round(float(weather["temperature_q10"][i]), 1),
-                round(float(weather["temperature_q90"][i]), 1),
-            ]
-        if "precip_q10_mm" in precip:
-            row["precip_range_mm"] = [
-                round(float(precip["precip_q10_mm"][i]), 2),
-                round(float(precip["precip_q90_mm"][i]), 2),
-            ]
-        forecast_rows.append(row)
+    # Round whole columns in one pass each; tolist() hands back plain
+    # Python floats/ints, so rows are just zipped together.
+    columns = {
+        "time": [t.isoformat() for t in df.index],
+        "lead_hours": df["lead_hours"].to_numpy().tolist(),
+        "temperature_c": np.round(weather["temperature"], 1).tolist(),
+        "humidity_pct": np.round(weather["humidity"]).tolist(),
+        "wind_speed_kmh": np.round(weather["wind_speed"], 1).tolist(),
+        "precip_probability_pct": np.round(precip["precip_probability"] * 100).tolist(),
+        "precip_expected_mm": np.round(precip["precip_expected_mm"], 2).tolist(),
+    }
+    if "temperature_q10" in weather:
+        columns["temperature_range_c"] = np.round(np.column_stack(
+            [weather["temperature_q10"], weather["temperature_q90"]]), 1).tolist()
+    if "precip_q10_mm" in precip:
+        columns["precip_range_mm"] = np.round(np.column_stack(
+            [precip["precip_q10_mm"], precip["precip_q90_mm"]]), 2).tolist()
+    keys = list(columns)
+    forecast_rows = [dict(zip(keys, values)) for values in zip(*columns.values())]
 
     output = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "location": {"lat": config.LATITUDE, "lon": config.LONGITUDE, "name": config.LOCATION_NAME},
         "hourly": forecast_rows,
+        "daily": daily_summaries(forecast_rows),
     }
 
     outpath = config.BASE_DIR / "latest_forecast.json"
-    with open(outpath, "w") as f:
-        json.dump(output, f, indent=2)
+    write_json(outpath, output, indent=True)
 
     print(f"[predict] Wrote {len(forecast_rows)} hours → {outpath}")
 
     # Preview next 24h
-    print(f"\n{'Time':>20s} {'Temp':>6s} {'Hum':>5s} {'Wind':>6s} {'P(rain)':>8s} {'Rain mm':>8s}")
-    print("-" * 60)
-    for row in forecast_rows[:24]:
-        print(
-            f"{row['time'][11:16]:>20s} "
-            f"{row['temperature_c']:>5.1f}° "
-            f"{row['humidity_pct']:>4.0f}% "
-            f"{row['wind_speed_kmh']:>5.1f} "
-            f"{row['precip_probability_pct']:>7.0f}% "
-            f"{row['precip_expected_mm']:>7.2f}"
-        )
-
+    preview = pd.DataFrame(forecast_rows[:24], columns=[
+        "time", "temperature_c", "humidity_pct", "wind_speed_kmh",
+        "precip_probability_pct", "precip_expected_mm",
+    ])
+    print()
+    print(preview.to_string(
+        index=False,
+        header=["Time", "Temp", "Hum", "Wind", "P(rain)", "Rain mm"],
+        formatters={
+            "time": lambda t: t[11:16],
+            "temperature_c": "{:.1f}°".format,
+            "humidity_pct": "{:.0f}%".format,
+            "wind_speed_kmh": "{:.1f}".format,
+            "precip_probability_pct": "{:.0f}%".format,
+            "precip_expected_mm": "{:.2f}".format,
+        },
+    ))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
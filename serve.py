@@ -1,28 +1,171 @@
 """
 Serve predictions via HTTP with HTML dashboard + visual charts.
-Start:  uv run python serve.py
+Start:  uv run python serve.py   (gunicorn with gunicorn.conf.py)
 """
-import json
+import gzip
+import os
 import subprocess
 import sys
-from base64 import b64decode
-from collections import OrderedDict
-from datetime import datetime, timezone
-
-from flask import Flask, Response, jsonify, render_template_string
-
+import threading
+from collections import OrderedDict, deque
+from datetime import date, datetime, timezone
+
+import numpy as np
+from flask import Flask, Response, jsonify, render_template, request, url_for
+from flask.json.provider import JSONProvider
+from jinja2 import DictLoader
+
+# matplotlib is loaded at import: under gunicorn's preload_app that happens
+# once in the master, not on some worker's first dashboard request
+import charts
 from config import BASE_DIR, LOCATION_NAME
+import jsonio
+from summaries import SUMMARY_KEYS, daily_summaries, hourly_columns, rounded
 
 app = Flask(__name__)
+app.config["TEMPLATES_AUTO_RELOAD"] = False  # templates are built in; never re-check
+
+
+class OrjsonProvider(JSONProvider):
+    """jsonify() through orjson; sorted keys and compact like Flask's default.
+
+    Unlike the default, non-ASCII text is sent as raw UTF-8, not escaped.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        return jsonio.dumps(obj, sort_keys=True).decode()
+
+    def loads(self, s, **kwargs):
+        return jsonio.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = jsonio.dumps(obj, sort_keys=True, newline=True)
+        return self._app.response_class(body, mimetype="application/json")
+
+
+if jsonio.orjson is not None:
+    app.json = OrjsonProvider(app)
 
 FORECAST_FILE = BASE_DIR / "latest_forecast.json"
 
+# gzip text bodies for clients that accept it — the hourly JSON and the
+# table page shrink ~8-10x.  Tiny bodies aren't worth the header overhead.
+COMPRESS_MIMETYPES = {"application/json", "text/html"}
+COMPRESS_LEVEL = 6
+COMPRESS_MIN_SIZE = 500
+
+# Names served by /chart/<name>
+CHART_NAMES = list(charts.CHART_FNS)
+
+
+_forecast_lock = threading.Lock()
+_forecast: dict | None = None
+_forecast_stamp: tuple[int, int] | None = None
+_forecast_days: dict[str, list[dict]] = {}  # "YYYY-MM-DD" → that day's hours
+
 
 def load_forecast() -> dict | None:
-    if not FORECAST_FILE.exists():
+    """Parsed latest_forecast.json, re-read only when the file changes.
+
+    The dict is shared between requests — treat it as read-only.
+    """
+    global _forecast, _forecast_stamp, _forecast_days
+    try:
+        st = FORECAST_FILE.stat()
+    except FileNotFoundError:
         return None
-    with open(FORECAST_FILE) as f:
-        return json.load(f)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _forecast_lock:
+        if _forecast is None or stamp != _forecast_stamp:
+            _forecast = jsonio.loads(FORECAST_FILE.read_bytes())
+            _forecast_stamp = stamp
+            _forecast_days = {}
+            for h in _forecast.get("hourly", []):
+                _forecast_days.setdefault(h["time"][:10], []).append(h)
+        return _forecast
+
+
+def hours_on(data: dict, day: str) -> list[dict]:
+    """The hours of ``data`` falling on ``day`` (YYYY-MM-DD)."""
+    with _forecast_lock:
+        if data is _forecast:
+            return _forecast_days.get(day, [])
+    return [h for h in data["hourly"] if h["time"].startswith(day)]
+
+
+def _forecast_etag(data: dict, *parts: str) -> str | None:
+    """ETag for a response built only from ``data`` (+ ``parts``).
+
+    None if a newer forecast was loaded meanwhile — the stamp would no
+    longer describe ``data``.
+    """
+    with _forecast_lock:
+        if data is not _forecast:
+            return None
+        mtime, size = _forecast_stamp
+    return "-".join([f"{mtime:x}.{size:x}", *parts])
+
+
+def _conditional(data: dict, build, *parts: str) -> Response:
+    """``build()``'s response with a weak ETag, or 304 if the client has it.
+
+    The ETag is checked first, so an unchanged resource is never rebuilt.
+    ``no-cache`` makes clients revalidate every time, so a /refresh shows up
+    on the next load — an unchanged forecast still costs only a 304.
+    """
+    etag = _forecast_etag(data, *parts)
+    if etag is None:
+        return build()
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = build()
+    response.set_etag(etag, weak=True)
+    response.cache_control.no_cache = True
+    return response
+
+
+# Rendered charts only change with the forecast: keyed on the identity of
+# the dict load_forecast hands out.  The lock also keeps two requests from
+# drawing on charts.py's shared figures at once.
+_charts_lock = threading.Lock()
+_charts_source: dict | None = None
+_chart_urls: dict[str, str] | None = None
+_chart_pngs: dict[str, bytes | None] = {}
+
+
+def _charts_cache_for(data: dict) -> None:
+    """Drop cached charts rendered from an older forecast (lock held)."""
+    global _charts_source, _chart_urls
+    if data is not _charts_source:
+        _charts_source, _chart_urls = data, None
+        _chart_pngs.clear()
+
+
+def dashboard_charts(data: dict) -> dict[str, str]:
+    """Dashboard image URLs, rendering the chart files once per forecast."""
+    global _chart_urls
+    with _charts_lock:
+        _charts_cache_for(data)
+        if _chart_urls is None:
+            # Charts are written as image files and served statically; the
+            # mtime in the query string keeps browsers from showing a stale image.
+            _chart_urls = {
+                name: url_for("static", filename=f"charts/{path.name}",
+                              v=path.stat().st_mtime_ns)
+                for name, path in charts.generate_all_charts(data["hourly"]).items()
+            }
+        return _chart_urls
+
+
+def chart_png(data: dict, name: str) -> bytes | None:
+    """PNG bytes for /chart/<name>, rendered once per forecast."""
+    with _charts_lock:
+        _charts_cache_for(data)
+        if name not in _chart_pngs:
+            _chart_pngs[name] = charts.generate_chart_png(data["hourly"], name)
+        return _chart_pngs[name]
 
 
 def rain_class(prob_pct: float) -> str:
@@ -37,7 +180,8 @@ def rain_class(prob_pct: float) -> str:
 #  HTML Templates
 # ═══════════════════════════════════════════════════════
 
-LAYOUT_HEAD = """
+# Page shell shared by both views: <head>/CSS, header, nav and summary cards
+BASE_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -130,9 +274,7 @@ LAYOUT_HEAD = """
     </style>
 </head>
 <body>
-"""
 
-CHARTS_TEMPLATE = LAYOUT_HEAD + """
     <h1>🌦 {{ location }} Forecast</h1>
     <div class="meta">
         Generated: {{ generated_at }} &nbsp;|&nbsp;
@@ -164,30 +306,35 @@ CHARTS_TEMPLATE = LAYOUT_HEAD + """
             <div class="value wind">{{ max_wind }} km/h</div>
         </div>
     </div>
+{% block content %}{% endblock %}</body>
+</html>
+"""
 
+CHARTS_TEMPLATE = """{% extends "base.html" %}
+{% block content %}
     <!-- Overview chart (full width) -->
     <div class="chart-container">
-        <img src="data:image/png;base64,{{ charts.overview }}" alt="Overview">
+        <img src="{{ charts.overview }}" alt="Overview">
     </div>
 
     <!-- Daily summary bar charts -->
     <div class="chart-container">
-        <img src="data:image/png;base64,{{ charts.daily_summary }}" alt="Daily Summary">
+        <img src="{{ charts.daily_summary }}" alt="Daily Summary">
     </div>
 
     <!-- Detail charts (2-column grid) -->
     <div class="chart-grid">
         <div class="chart-container">
-            <img src="data:image/png;base64,{{ charts.temperature }}" alt="Temperature">
+            <img src="{{ charts.temperature }}" alt="Temperature">
         </div>
         <div class="chart-container">
-            <img src="data:image/png;base64,{{ charts.precipitation }}" alt="Precipitation">
+            <img src="{{ charts.precipitation }}" alt="Precipitation">
         </div>
         <div class="chart-container">
-            <img src="data:image/png;base64,{{ charts.wind }}" alt="Wind">
+            <img src="{{ charts.wind }}" alt="Wind">
         </div>
         <div class="chart-container">
-            <img src="data:image/png;base64,{{ charts.humidity }}" alt="Humidity">
+            <img src="{{ charts.humidity }}" alt="Humidity">
         </div>
     </div>
 
@@ -206,43 +353,11 @@ CHARTS_TEMPLATE = LAYOUT_HEAD + """
         <code>GET</code> <a href="/forecast/summary">/forecast/summary</a> — daily summaries JSON<br>
         <code>POST</code> <code>/refresh</code> — re-run predict.py
     </div>
-</body>
-</html>
+{% endblock %}
 """
 
-TABLE_TEMPLATE = LAYOUT_HEAD + """
-    <h1>🌦 {{ location }} Forecast</h1>
-    <div class="meta">
-        Generated: {{ generated_at }} &nbsp;|&nbsp;
-        {{ total_hours }} hours &nbsp;|&nbsp; {{ num_days }} days
-    </div>
-
-    <nav>
-        <a href="/" class="{{ 'active' if page == 'charts' else '' }}">📊 Charts</a>
-        <a href="/table" class="{{ 'active' if page == 'table' else '' }}">📋 Table</a>
-        <a href="/forecast/summary">📅 Daily JSON</a>
-        <a href="/forecast">🔧 Full JSON</a>
-    </nav>
-
-    <div class="summary-bar">
-        <div class="summary-card">
-            <div class="label">Temperature Range</div>
-            <div class="value temp">{{ temp_min }}° – {{ temp_max }}°C</div>
-        </div>
-        <div class="summary-card">
-            <div class="label">Max Rain Probability</div>
-            <div class="value rain-high">{{ max_rain_prob }}%</div>
-        </div>
-        <div class="summary-card">
-            <div class="label">Total Expected Rain</div>
-            <div class="value rain-med">{{ total_rain_mm }} mm</div>
-        </div>
-        <div class="summary-card">
-            <div class="label">Max Wind</div>
-            <div class="value wind">{{ max_wind }} km/h</div>
-        </div>
-    </div>
-
+TABLE_TEMPLATE = """{% extends "base.html" %}
+{% block content %}
     {% for day_name, hours in days %}
     <div class="day-group">
         <div class="day-header">{{ day_name }}</div>
@@ -272,10 +387,17 @@ TABLE_TEMPLATE = LAYOUT_HEAD + """
         </table>
     </div>
     {% endfor %}
-</body>
-</html>
+{% endblock %}
 """
 
+# Compiled once on the app's environment; render_template_string would
+# re-parse the whole page on every request.  render_template accepts the
+# compiled Template, so context processors and signals still apply.
+# Both pages {% extends %} base.html, served to Jinja from memory.
+app.jinja_loader = DictLoader({"base.html": BASE_TEMPLATE})
+CHARTS_TPL = app.jinja_env.from_string(CHARTS_TEMPLATE)
+TABLE_TPL = app.jinja_env.from_string(TABLE_TEMPLATE)
+
 
 # ═══════════════════════════════════════════════════════
 #  Helpers
@@ -284,22 +406,19 @@ TABLE_TEMPLATE = LAYOUT_HEAD + """
 def _summary_vars(data: dict) -> dict:
     """Compute summary stats for templates."""
     hourly = data["hourly"]
-    temps = [h["temperature_c"] for h in hourly
-             if isinstance(h.get("temperature_c"), (int, float))]
-    probs = [h.get("precip_probability_pct", 0) for h in hourly]
-    rains = [h.get("precip_expected_mm", 0) for h in hourly]
-    winds = [h.get("wind_speed_kmh", 0) for h in hourly
-             if isinstance(h.get("wind_speed_kmh"), (int, float))]
-
-    # Group by day for table view
+    temps, probs, rains, winds = hourly_columns(hourly, SUMMARY_KEYS)
+
+    # Group by day for table view.  Times are ISO strings, so the day and
+    # hour are plain slices; each day's heading is formatted once.
     days = OrderedDict()
+    day_names: dict[str, str] = {}
     for h in hourly:
-        dt = datetime.fromisoformat(h["time"])
-        day_key = dt.strftime("%A, %B %d")
-        if day_key not in days:
-            days[day_key] = []
-        days[day_key].append({
-            "hour": dt.strftime("%H:%M"),
+        iso_day = h["time"][:10]
+        day_key = day_names.get(iso_day)
+        if day_key is None:
+            day_key = day_names[iso_day] = date.fromisoformat(iso_day).strftime("%A, %B %d")
+        days.setdefault(day_key, []).append({
+            "hour": h["time"][11:16],
             "temperature_c": h.get("temperature_c", "—"),
             "humidity_pct": h.get("humidity_pct", 0),
             "wind_speed_kmh": h.get("wind_speed_kmh", "—"),
@@ -313,11 +432,11 @@ def _summary_vars(data: dict) -> dict:
         "generated_at": data.get("generated_at", "unknown"),
         "total_hours": len(hourly),
         "num_days": len(days),
-        "temp_min": round(min(temps), 1) if temps else "—",
-        "temp_max": round(max(temps), 1) if temps else "—",
-        "max_rain_prob": round(max(probs), 0) if probs else 0,
-        "total_rain_mm": round(sum(rains), 1) if rains else 0,
-        "max_wind": round(max(winds), 1) if winds else "—",
+        "temp_min": rounded(np.nanmin, temps, 1, "—"),
+        "temp_max": rounded(np.nanmax, temps, 1, "—"),
+        "max_rain_prob": rounded(np.nanmax, probs, 0, 0),
+        "total_rain_mm": rounded(np.nansum, rains, 1, 0),
+        "max_wind": rounded(np.nanmax, winds, 1, "—"),
         "days": list(days.items()),
     }
 
@@ -326,6 +445,24 @@ def _summary_vars(data: dict) -> dict:
 #  Routes
 # ═══════════════════════════════════════════════════════
 
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """gzip JSON / HTML bodies when the client sends Accept-Encoding: gzip."""
+    if (response.mimetype not in COMPRESS_MIMETYPES
+            or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers):
+        return response
+    response.vary.add("Accept-Encoding")
+    if response.status_code != 200 or "gzip" not in request.accept_encodings:
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0))
+    response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
 @app.route("/")
 def index():
     """Charts dashboard (default landing page)."""
@@ -336,15 +473,11 @@ def index():
                 "<p style='color:#888;background:#0f1923;padding:0 40px'>"
                 "Run: <code>uv run python predict.py</code></p>"), 404
 
-    # Import here so matplotlib isn't loaded until needed
-    from charts import generate_all_charts
-    charts = generate_all_charts(data["hourly"])
-
     ctx = _summary_vars(data)
-    ctx["charts"] = charts
+    ctx["charts"] = dashboard_charts(data)
     ctx["page"] = "charts"
 
-    return render_template_string(CHARTS_TEMPLATE, **ctx)
+    return render_template(CHARTS_TPL, **ctx)
 
 
 @app.route("/table")
@@ -357,7 +490,7 @@ def table_view():
     ctx = _summary_vars(data)
     ctx["page"] = "table"
 
-    return render_template_string(TABLE_TEMPLATE, **ctx)
+    return render_template(TABLE_TPL, **ctx)
 
 
 @app.route("/chart/<name>")
@@ -367,17 +500,15 @@ def single_chart(name: str):
     if not data:
         return "No forecast data", 404
 
-    from charts import generate_single_chart
-    b64 = generate_single_chart(data["hourly"], name)
-    if b64 is None:
-        valid = ["overview", "temperature", "precipitation",
-                 "wind", "humidity", "daily_summary"]
+    if name not in CHART_NAMES:
         return jsonify({"error": f"Unknown chart: {name}",
-                        "valid_names": valid}), 404
+                        "valid_names": CHART_NAMES}), 404
 
-    png_bytes = b64decode(b64)
-    return Response(png_bytes, mimetype="image/png",
-                    headers={"Content-Disposition": f"inline; filename={name}.png"})
+    def build():
+        return Response(chart_png(data, name), mimetype="image/png",
+                        headers={"Content-Disposition": f"inline; filename={name}.png"})
+
+    return _conditional(data, build, "chart", name)
 
 
 @app.route("/forecast")
@@ -386,7 +517,7 @@ def forecast_json():
     data = load_forecast()
     if not data:
         return jsonify({"error": "No forecast available."}), 404
-    return jsonify(data)
+    return _conditional(data, lambda: jsonify(data), "forecast")
 
 
 @app.route("/forecast/today")
@@ -396,9 +527,12 @@ def forecast_today():
     if not data:
         return jsonify({"error": "No forecast available."}), 404
     today = datetime.now().strftime("%Y-%m-%d")
-    today_hours = [h for h in data["hourly"] if h["time"].startswith(today)]
-    return jsonify({"date": today, "location": data.get("location"),
-                    "hourly": today_hours})
+
+    def build():
+        return jsonify({"date": today, "location": data.get("location"),
+                        "hourly": hours_on(data, today)})
+
+    return _conditional(data, build, "today", today)
 
 
 @app.route("/forecast/summary")
@@ -408,28 +542,14 @@ def forecast_summary():
     if not data:
         return jsonify({"error": "No forecast available."}), 404
 
-    days_agg = OrderedDict()
-    for h in data["hourly"]:
-        day = h["time"][:10]
-        if day not in days_agg:
-            days_agg[day] = {"temps": [], "rain": [], "wind": [], "probs": []}
-        days_agg[day]["temps"].append(h.get("temperature_c", 0))
-        days_agg[day]["rain"].append(h.get("precip_expected_mm", 0))
-        days_agg[day]["wind"].append(h.get("wind_speed_kmh", 0))
-        days_agg[day]["probs"].append(h.get("precip_probability_pct", 0))
-
-    summaries = []
-    for day, vals in days_agg.items():
-        summaries.append({
-            "date": day,
-            "temp_min_c": round(min(vals["temps"]), 1),
-            "temp_max_c": round(max(vals["temps"]), 1),
-            "total_rain_mm": round(sum(vals["rain"]), 2),
-            "max_rain_probability_pct": round(max(vals["probs"]), 0),
-            "max_wind_kmh": round(max(vals["wind"]), 1),
-        })
+    def build():
+        # Written with the forecast; only files from before that are aggregated here
+        daily = data.get("daily")
+        if daily is None:
+            daily = daily_summaries(data["hourly"])
+        return jsonify({"location": data.get("location"), "daily": daily})
 
-    return jsonify({"location": data.get("location"), "daily": summaries})
+    return _conditional(data, build, "summary")
 
 
 @app.route("/health")
@@ -443,16 +563,38 @@ def health():
     return jsonify(status)
 
 
+def _run_tailed(cmd: list[str], timeout: float, max_lines: int = 40) -> tuple[int, str, str]:
+    """Run ``cmd`` in BASE_DIR → (returncode, stdout tail, stderr tail).
+
+    Output is streamed into bounded deques as it arrives, so only the last
+    ``max_lines`` of each stream are ever held.  On timeout the process is
+    killed and TimeoutExpired propagates, like subprocess.run.
+    """
+    with subprocess.Popen(cmd, cwd=BASE_DIR, text=True,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+        tails = (deque(maxlen=max_lines), deque(maxlen=max_lines))
+        readers = [threading.Thread(target=tail.extend, args=(stream,), daemon=True)
+                   for tail, stream in zip(tails, (proc.stdout, proc.stderr))]
+        for reader in readers:
+            reader.start()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+    return proc.returncode, "".join(tails[0]), "".join(tails[1])
+
+
 @app.route("/refresh", methods=["POST"])
 def refresh():
     try:
-        result = subprocess.run(
-            [sys.executable, "predict.py"],
-            cwd=BASE_DIR, capture_output=True, text=True, timeout=60,
-        )
-        return jsonify({"status": "ok" if result.returncode == 0 else "error",
-                        "stdout": result.stdout[-500:],
-                        "stderr": result.stderr[-500:]})
+        returncode, stdout, stderr = _run_tailed([sys.executable, "predict.py"], timeout=60)
+        return jsonify({"status": "ok" if returncode == 0 else "error",
+                        "stdout": stdout[-500:],
+                        "stderr": stderr[-500:]})
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
@@ -467,4 +609,13 @@ if __name__ == "__main__":
     print(f"  🔧 JSON API:   http://localhost:5000/forecast")
     print(f"  📅 Summaries:  http://localhost:5000/forecast/summary")
     print(f"  ❤️  Health:     http://localhost:5000/health")
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    # Same server setup as production (gunicorn.conf.py).  gunicorn is
+    # POSIX-only (it needs fcntl and fork) even where it installs, so
+    # elsewhere (Windows) fall back to the Werkzeug dev server — threaded,
+    # and without debug mode's reloader and template re-checks.
+    if os.name == "posix":
+        os.execv(sys.executable, [
+            sys.executable, "-m", "gunicorn", "--chdir", str(BASE_DIR),
+            "-c", str(BASE_DIR / "gunicorn.conf.py"), "serve:app",
+        ])
+    app.run(host="0.0.0.0", port=5000, threaded=True)
\ No newline at end of file
@@ -4,6 +4,10 @@ Runs once before gunicorn starts serving.
 """
 import sys
 import time
+from datetime import datetime, timezone
+
+import requests
+
 
 def run():
     print("=" * 60)
@@ -42,10 +46,9 @@ def run():
     config.HISTORY_YEARS = original_years
 
     # Check data
-    conn = db.get_conn()
-    obs = conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
-    fcst = conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0]
-    conn.close()
+    with db.checkout() as conn:
+        obs = conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+        fcst = conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0]
     print(f"\n[startup] Observations: {obs}")
     print(f"[startup] Forecasts:    {fcst}")
 
@@ -85,12 +88,16 @@ def run():
     print("=" * 60)
 
 
+def _rounded(value, ndigits):
+    """round() that passes Open-Meteo's nulls through."""
+    return None if value is None else round(value, ndigits)
+
+
 def generate_raw_forecast():
     """Fallback: serve raw Open-Meteo forecasts without ML correction."""
-    import json
-    from datetime import datetime, timezone
-    import requests
     import config
+    import jsonio
+    from summaries import daily_summaries
 
     resp = requests.get(
         "https://api.open-meteo.com/v1/forecast",
@@ -104,19 +111,27 @@ def generate_raw_forecast():
         timeout=30,
     )
     resp.raise_for_status()
-    data = resp.json()["hourly"]
-
-    hourly = []
-    for i, t in enumerate(data["time"]):
-        hourly.append({
+    data = jsonio.loads(resp.content)["hourly"]
+
+    # Walk the columns in lockstep; the probability fallback is built once.
+    # Values are rounded to the precision predict.py writes (0.1 °C etc.).
+    times = data["time"]
+    prob = data.get("precipitation_probability") or [0] * len(times)
+    hourly = [
+        {
             "time": t,
             "lead_hours": i,
-            "temperature_c": data["temperature_2m"][i],
-            "humidity_pct": data["relative_humidity_2m"][i],
-            "wind_speed_kmh": data["wind_speed_10m"][i],
-            "precip_probability_pct": data.get("precipitation_probability", [0] * len(data["time"]))[i] or 0,
-            "precip_expected_mm": data["precipitation"][i] or 0,
-        })
+            "temperature_c": _rounded(temp, 1),
+            "humidity_pct": _rounded(hum, 0),
+            "wind_speed_kmh": _rounded(wind, 1),
+            "precip_probability_pct": round(p or 0),
+            "precip_expected_mm": round(rain or 0, 2),
+        }
+        for i, (t, temp, hum, wind, p, rain) in enumerate(zip(
+            times, data["temperature_2m"], data["relative_humidity_2m"],
+            data["wind_speed_10m"], prob, data["precipitation"],
+        ))
+    ]
 
     output = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -127,11 +142,11 @@ def generate_raw_forecast():
         },
         "note": "Raw NWP forecast — ML models not yet trained",
         "hourly": hourly,
+        "daily": daily_summaries(hourly),
     }
 
     outpath = config.BASE_DIR / "latest_forecast.json"
-    with open(outpath, "w") as f:
-        json.dump(output, f, indent=2)
+    jsonio.write_json(outpath, output)  # compact: only the server reads it
     print(f"[startup] Wrote raw forecast → {outpath}")
 
 
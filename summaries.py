@@ -0,0 +1,61 @@
+"""
+Daily summary aggregates of an hourly forecast.
+Computed by the forecast writers (predict.py, startup.py) and the server.
+"""
+import numpy as np
+
+SUMMARY_KEYS = ("temperature_c", "precip_probability_pct",
+                "precip_expected_mm", "wind_speed_kmh")
+
+
+def hourly_columns(hourly: list[dict], keys: tuple[str, ...], default=np.nan) -> np.ndarray:
+    """(len(keys), N) float64 block — one row per key across the hours.
+
+    Absent keys read as ``default``; None and non-numeric values as NaN.
+    """
+    columns = [[h.get(k, default) for h in hourly] for k in keys]
+    try:
+        arr = np.array(columns, dtype=np.float64)
+    except (TypeError, ValueError):
+        arr = np.array(
+            [[v if isinstance(v, (int, float)) else np.nan for v in col] for col in columns],
+            dtype=np.float64,
+        )
+    return arr.reshape(len(keys), len(hourly))
+
+
+def rounded(reduce, values: np.ndarray, ndigits: int, empty):
+    """``round(reduce(values), ndigits)`` over the non-NaN values; ``empty`` if none."""
+    if np.isnan(values).all():
+        return empty
+    return round(float(reduce(values)), ndigits)
+
+
+def daily_summaries(hourly: list[dict]) -> list[dict]:
+    """Per-day min/max/total aggregates (the /forecast/summary ``daily`` list).
+
+    Hours are grouped into contiguous per-day runs and each statistic is
+    one ``reduceat`` over all days (fmin/fmax skip NaN).
+    """
+    if not hourly:
+        return []
+    block = hourly_columns(hourly, SUMMARY_KEYS, default=0)
+    days = [h["time"][:10] for h in hourly]
+    if days != sorted(days):
+        order = sorted(range(len(days)), key=days.__getitem__)
+        days, block = [days[i] for i in order], block[:, order]
+    starts = [i for i, day in enumerate(days) if i == 0 or day != days[i - 1]]
+    temps, probs, rains, winds = block
+
+    columns = {
+        "temp_min_c": (np.fmin.reduceat(temps, starts), 1),
+        "temp_max_c": (np.fmax.reduceat(temps, starts), 1),
+        "total_rain_mm": (np.add.reduceat(np.nan_to_num(rains), starts), 2),
+        "max_rain_probability_pct": (np.fmax.reduceat(probs, starts), 0),
+        "max_wind_kmh": (np.fmax.reduceat(winds, starts), 1),
+    }
+    summaries = [{"date": days[i]} for i in starts]
+    for key, (values, ndigits) in columns.items():
+        for summary, value in zip(summaries, values.tolist()):
+            summary[key] = None if value != value else round(value, ndigits)
+    return summaries
@@ -0,0 +1,47 @@
+"""Chart rendering regression tests.  Run:  python -m unittest discover tests"""
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import charts
+
+
+def _hourly(hours: int) -> list[dict]:
+    start = datetime(2026, 10, 15)
+    return [
+        {
+            "time": (start + timedelta(hours=i)).isoformat(),
+            "lead_hours": i,
+            "temperature_c": 15 + 8 * ((i % 24) / 24),
+            "humidity_pct": 40 + (i % 30),
+            "wind_speed_kmh": 5 + (i % 12),
+            "precip_probability_pct": (i * 7) % 100,
+            "precip_expected_mm": (i % 5) * 0.2,
+        }
+        for i in range(hours)
+    ]
+
+
+class CachedFigureTests(unittest.TestCase):
+    def setUp(self):
+        charts._FIG_CACHE.clear()
+
+    def test_short_span_after_long_matches_fresh_render(self):
+        short = _hourly(48)
+        fresh = {name: charts.generate_chart_png(short, name) for name in charts.CHART_FNS}
+
+        charts._FIG_CACHE.clear()
+        for name in charts.CHART_FNS:
+            charts.generate_chart_png(_hourly(168), name)
+        reused = {name: charts.generate_chart_png(short, name) for name in charts.CHART_FNS}
+
+        for name in charts.CHART_FNS:
+            with self.subTest(chart=name):
+                self.assertEqual(reused[name], fresh[name])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,14 +3,11 @@ Daily verification: how did yesterday's forecasts perform?
 Run daily:  0 8 * * *  uv run python verify.py
 """
 import numpy as np
-import pandas as pd
 
 import db
 
 
 def main() -> None:
-    conn = db.get_conn()
-
     query = """
         WITH ranked AS (
             SELECT f.*, o.temperature_2m AS obs_temp,
@@ -26,52 +23,58 @@ def main() -> None:
               AND date(f.valid_time) >= date('now', '-2 days')
               AND date(f.valid_time) < date('now')
         )
-        SELECT * FROM ranked WHERE rn = 1
+        SELECT temperature_2m, obs_temp, precipitation, obs_precip,
+               wind_speed_10m, obs_wind
+        FROM ranked WHERE rn = 1
         ORDER BY valid_time
     """
-    df = pd.read_sql(query, conn, parse_dates=["valid_time"])
-    conn.close()
+    # Plain float64 arrays (NULL → NaN) — the stats below are a handful of
+    # numpy reductions, no DataFrame needed
+    with db.checkout() as conn:
+        cols = db.fetch_columns(conn, query)
 
-    if df.empty:
+    n_hours = len(cols["obs_temp"])
+    if n_hours == 0:
         print("[verify] No verification data for yesterday.")
         return
 
-    print(f"[verify] {len(df)} hours verified\n")
+    print(f"[verify] {n_hours} hours verified\n")
 
-    # Temperature
-    temp_errors = df["temperature_2m"] - df["obs_temp"]
+    # Temperature (nan* skips hours with a missing value, like pandas did)
+    temp_errors = cols["temperature_2m"] - cols["obs_temp"]
+    temp_mae = np.nanmean(np.abs(temp_errors))
     print(f"Temperature:")
-    print(f"  MAE  = {temp_errors.abs().mean():.2f}°C")
-    print(f"  Bias = {temp_errors.mean():+.2f}°C")
+    print(f"  MAE  = {temp_mae:.2f}°C")
+    print(f"  Bias = {np.nanmean(temp_errors):+.2f}°C")
 
     # Precipitation
-    precip_errors = df["precipitation"] - df["obs_precip"]
+    precip_errors = cols["precipitation"] - cols["obs_precip"]
+    precip_bias = np.nanmean(precip_errors)
     print(f"\nPrecipitation:")
-    print(f"  MAE  = {precip_errors.abs().mean():.2f} mm")
-    print(f"  Bias = {precip_errors.mean():+.2f} mm")
+    print(f"  MAE  = {np.nanmean(np.abs(precip_errors)):.2f} mm")
+    print(f"  Bias = {precip_bias:+.2f} mm")
 
-    obs_rain = (df["obs_precip"] >= 0.1).astype(int)
-    fcst_rain = (df["precipitation"] >= 0.1).astype(int)
-    hits = ((obs_rain == 1) & (fcst_rain == 1)).sum()
-    misses = ((obs_rain == 1) & (fcst_rain == 0)).sum()
-    false_alarms = ((obs_rain == 0) & (fcst_rain == 1)).sum()
+    obs_rain = cols["obs_precip"] >= 0.1
+    fcst_rain = cols["precipitation"] >= 0.1
+    hits = np.count_nonzero(obs_rain & fcst_rain)
+    misses = np.count_nonzero(obs_rain & ~fcst_rain)
+    false_alarms = np.count_nonzero(~obs_rain & fcst_rain)
     pod = hits / max(hits + misses, 1)
     far = false_alarms / max(hits + false_alarms, 1)
     print(f"  POD (hit rate) = {pod:.2%}")
     print(f"  FAR            = {far:.2%}")
 
     # Wind
-    wind_errors = df["wind_speed_10m"] - df["obs_wind"]
+    wind_errors = cols["wind_speed_10m"] - cols["obs_wind"]
     print(f"\nWind speed:")
-    print(f"  MAE  = {wind_errors.abs().mean():.2f} km/h")
-    print(f"  Bias = {wind_errors.mean():+.2f} km/h")
+    print(f"  MAE  = {np.nanmean(np.abs(wind_errors)):.2f} km/h")
+    print(f"  Bias = {np.nanmean(wind_errors):+.2f} km/h")
 
     # Alerts
-    temp_mae = temp_errors.abs().mean()
     if temp_mae > 3.0:
         print(f"\n⚠️  Temperature MAE ({temp_mae:.1f}°C) exceeds threshold — consider retraining")
-    if abs(precip_errors.mean()) > 1.0:
-        print(f"\n⚠️  Precipitation bias ({precip_errors.mean():+.1f} mm) — consider retraining")
+    if abs(precip_bias) > 1.0:
+        print(f"\n⚠️  Precipitation bias ({precip_bias:+.1f} mm) — consider retraining")
 
 
 if __name__ == "__main__":
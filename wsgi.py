@@ -3,24 +3,45 @@ WSGI entry point for Render / gunicorn.
 Runs startup initialization, then serves the Flask app.
 """
 import os
+import subprocess
 import sys
 
+try:
+    import fcntl
+except ImportError:  # not POSIX (Windows) — no gunicorn there either
+    fcntl = None
+
 # Run startup if the forecast file doesn't exist yet
 # (avoids re-running on gunicorn worker respawns)
 from config import BASE_DIR
 
 forecast_file = BASE_DIR / "latest_forecast.json"
 
-if not forecast_file.exists():
-    print("[wsgi] No forecast file found — running startup...")
-    import startup
-    startup.run()
-else:
-    print("[wsgi] Forecast file exists — skipping startup.")
+# preload_app already runs this once per master, but a second server
+# process (or a run without preload) would backfill and train all over
+# again.  The check-and-run happens under an exclusive file lock: the
+# first process does the startup, the rest wait and then find the file.
+# Without fcntl there is a single dev-server process, so no lock is needed.
+with open(BASE_DIR / ".startup.lock", "w") as lockfile:
+    if fcntl is not None:
+        fcntl.flock(lockfile, fcntl.LOCK_EX)
+    if not forecast_file.exists():
+        print("[wsgi] No forecast file found — running startup...")
+        # In a child process: training here would leave OpenMP state in the
+        # preloading master, and libgomp hangs in forked workers that then
+        # run LightGBM (the background refresh).
+        result = subprocess.run([sys.executable, str(BASE_DIR / "startup.py")], cwd=BASE_DIR)
+        if result.returncode != 0:
+            # Same outcome as the in-process startup.run() raising: don't boot
+            raise RuntimeError(f"[wsgi] startup.py failed (exit code {result.returncode})")
+        print("[wsgi] Startup finished.")
+    else:
+        print("[wsgi] Forecast file exists — skipping startup.")
 
-# Start background refresh thread
+# The background refresh thread is started per worker by gunicorn.conf.py's
+# post_worker_init hook — never here in the (preloading) master, whose forks would
+# inherit a refresh caught mid-operation.
 from background import start_background_thread
-start_background_thread()
 
 # Import the Flask app for gunicorn
 from serve import app
@@ -29,4 +50,5 @@ from serve import app
 port = int(os.environ.get("PORT", 5000))
 
 if __name__ == "__main__":
+    start_background_thread()
     app.run(host="0.0.0.0", port=port)
\ No newline at end of file